@@ -1,19 +1,29 @@
 from datetime import datetime, timedelta
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Security
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, Security
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import traceback
 import logging
 from fastapi.responses import JSONResponse
 
 from core.config import settings
-from database import get_db
+from core.rate_limit import limit_auth_attempts
+from core.security import (
+    create_stream_ticket,
+    decode_token,
+    hash_password,
+    pwd_context,
+    redeem_stream_ticket,
+    verify_and_update_password
+)
+from database import get_db, get_read_committed_db
 from models.user import User
-from schemas.user import UserCreate, UserResponse, Token, TokenData
+from schemas.user import UserCreate, UserResponse, StreamTicket, Token, TokenData
+from services.principal import Principal, get_profile, resolve_principal
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -21,10 +31,10 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# Blocking versions for scripts such as create_admin.py; request handlers use
+# hash_password / verify_and_update_password from core.security
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -38,12 +48,12 @@ def create_access_token(data: dict) -> str:
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-async def verify_token(token: str = Depends(oauth2_scheme)) -> dict:
+def decode_access_token(token: str, request: Optional[Request] = None) -> dict:
+    # JWTMiddleware đã verify token này thì dùng lại payload của nó
+    if request is not None and getattr(request.state, "token", None) == token:
+        return request.state.user_data
     try:
-        logger.info(f"Verifying token: {token[:20]}...")  # Log first 20 chars of token
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        logger.info(f"Token payload: {payload}")  # Log decoded payload
-        return payload
+        return decode_token(token)
     except JWTError as e:
         logger.error(f"JWT verification failed: {str(e)}")
         raise HTTPException(
@@ -51,13 +61,56 @@ async def verify_token(token: str = Depends(oauth2_scheme)) -> dict:
             detail="Could not validate token"
         )
 
-@router.post("/register", response_model=UserResponse)
-async def register(user: UserCreate, db: Session = Depends(get_db)):
+async def verify_token(request: Request, token: str = Depends(oauth2_scheme)) -> dict:
+    return decode_access_token(token, request)
+
+async def get_current_principal(
+    token_data: dict = Depends(verify_token),
+    db: AsyncSession = Depends(get_read_committed_db)
+) -> Principal:
+    """The caller's id, type and name, usually without touching the database"""
+    principal = await resolve_principal(db, token_data)
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate token"
+        )
+    return principal
+
+async def require_admin(principal: Principal = Depends(get_current_principal)) -> Principal:
+    """The caller, if they are an admin; 403 otherwise"""
+    if principal.type != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required"
+        )
+    return principal
+
+async def verify_stream_ticket(
+    ticket: str = Query(..., description="Single-use ticket from POST /auth/stream-ticket")
+) -> dict:
+    """Authenticate clients such as EventSource that cannot send headers.
+
+    Takes a short-lived single-use ticket rather than the access token, so
+    the long-lived token never appears in a URL (and in access logs).
+    """
+    try:
+        return redeem_stream_ticket(ticket)
+    except JWTError as e:
+        logger.warning(f"Stream ticket rejected: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired stream ticket"
+        )
+
+@router.post("/register", response_model=UserResponse, dependencies=[Depends(limit_auth_attempts("register"))])
+async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
     logger.info(f"Registration attempt for email: {user.email}")
     
     try:
         # Check if user exists
-        existing_user = db.query(User).filter(User.email == user.email).first()
+        result = await db.execute(select(User).where(User.email == user.email))
+        existing_user = result.scalars().first()
         if existing_user:
             logger.warning(f"Email {user.email} already registered")
             raise HTTPException(
@@ -66,7 +119,7 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
             )
 
         # Create new user
-        hashed_password = get_password_hash(user.password)
+        hashed_password = await hash_password(user.password)
         new_user = User(
             name=user.name,
             email=user.email,
@@ -78,8 +131,8 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
         
         logger.info(f"Creating new user with email: {user.email}")
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        await db.commit()
+        await db.refresh(new_user)
         
         logger.info(f"User {user.email} registered successfully")
         return {
@@ -97,35 +150,51 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
     except Exception as e:
         logger.error(f"Error during registration: {str(e)}")
         logger.error(traceback.format_exc())
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal Server Error: {str(e)}"
         )
 
-@router.post("/login", response_model=Token)
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+@router.post("/login", response_model=Token, dependencies=[Depends(limit_auth_attempts("login"))])
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
     logger.info(f"Login attempt for email: {form_data.username}")
     
     try:
-        user = db.query(User).filter(User.email == form_data.username).first()
-        if not user or not verify_password(form_data.password, user.hashed_password):
+        result = await db.execute(select(User).where(User.email == form_data.username))
+        user = result.scalars().first()
+        valid, new_hash = False, None
+        if user:
+            valid, new_hash = await verify_and_update_password(form_data.password, user.hashed_password)
+        if not valid:
             logger.warning(f"Invalid login attempt for email: {form_data.username}")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        
-        # Create token with user type included
-        access_token = create_access_token(data={"sub": user.email, "type": user.type})
+
+        # Create token with user id and type included
+        access_token = create_access_token(data={"sub": user.email, "uid": user.id, "type": user.type})
         logger.info(f"Token created for user: {user.email}")
-        
-        return {
+        token = {
             "access_token": access_token, 
             "token_type": "bearer",
             "user_type": user.type
         }
+
+        # Hash cũ (cost khác BCRYPT_ROUNDS): lưu hash mới, lỗi ở đây không
+        # làm hỏng việc đăng nhập
+        if new_hash:
+            try:
+                user.hashed_password = new_hash
+                await db.commit()
+                logger.info(f"Password hash upgraded for user: {form_data.username}")
+            except Exception as e:
+                logger.warning(f"Could not upgrade password hash for {form_data.username}: {str(e)}")
+                await db.rollback()
+
+        return token
     except HTTPException:
         raise
     except Exception as e:
@@ -137,30 +206,21 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
         )
 
 @router.get("/me", response_model=UserResponse)
-async def read_users_me(token_data: dict = Depends(verify_token), db: Session = Depends(get_db)):
+async def read_users_me(token_data: dict = Depends(verify_token), db: AsyncSession = Depends(get_read_committed_db)):
     logger.info(f"Getting user info for email: {token_data.get('sub')}")
     
     try:
-        user = db.query(User).filter(User.email == token_data.get("sub")).first()
-        if not user:
+        # Cả principal lẫn profile đều lấy từ cache, bị xóa khi user thay đổi
+        principal = await resolve_principal(db, token_data)
+        profile = await get_profile(db, principal.id) if principal is not None else None
+        if not profile:
             logger.warning(f"User not found for email: {token_data.get('sub')}")
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
-        
-        # Convert SQLAlchemy model to dict
-        user_dict = {
-            "id": user.id,
-            "name": user.name,
-            "email": user.email,
-            "date_of_birth": user.date_of_birth,
-            "phone_number": user.phone_number,
-            "type": user.type,
-            "hashed_password": user.hashed_password
-        }
-        
-        return user_dict
+
+        return profile
     except HTTPException:
         raise
     except Exception as e:
@@ -171,8 +231,16 @@ async def read_users_me(token_data: dict = Depends(verify_token), db: Session =
             detail=f"Internal Server Error: {str(e)}"
         )
 
+@router.post("/stream-ticket", response_model=StreamTicket)
+async def issue_stream_ticket(token_data: dict = Depends(verify_token)):
+    """Single-use ticket for opening GET /seats/stream?ticket=..."""
+    return {
+        "ticket": create_stream_ticket(token_data),
+        "expires_in": settings.STREAM_TICKET_TTL_SECONDS
+    }
+
 @router.get("/verify")
-async def verify_token(token_data: dict = Depends(verify_token)):
+async def verify(token_data: dict = Depends(verify_token)):
     try:
         return {"valid": True, "user": token_data}
     except Exception as e:
@@ -1,15 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
-from typing import List, Dict
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select, tuple_, update
+from typing import List, Dict, Optional
 from datetime import datetime
-from pydantic import BaseModel
-import logging
 
-from database import get_db
+from database import get_db, get_read_committed_db, get_replica_db, run_in_transaction
 from models.booking import Booking
 from models.bookingdetail import BookingDetail
-from models.seat import Seat
 from models.ticket_type import TicketType
 from models.user import User
 from schemas.booking import (
@@ -17,13 +14,31 @@ from schemas.booking import (
     BookingResponse,
     ErrorResponse,
     BookingUpdate,
-    AggregatedBookingDetail,
-    TicketTypeResponse,
     BookingStatusResponse,
     AdminBookingListItem,
-    AdminBookingDetail
+    AdminBookingDetail,
+    BulkBookingStatusUpdate,
+    BulkBookingStatusResult,
+    BulkBookingStatusResponse,
+    normalize_booking_status
 )
-from api.auth import verify_token
+from api.auth import get_current_principal, require_admin, verify_token
+from core.admission import admit_booking
+from core.config import settings
+from core.pagination import NEXT_CURSOR_HEADER, InvalidCursor, decode_cursor, encode_cursor
+from core.responses import FastJSONResponse, dumps
+from core.idempotency import IDEMPOTENCY_HEADER, idempotency_store
+from services.booking import (
+    admin_booking_detail_cache,
+    allocate_seats,
+    get_ticket_types_by_id,
+    insert_booking_details,
+    release_booking_seats
+)
+from services.principal import Principal
+from services.sales_rollup import apply_sales_rollup, sales_sign
+from services.seat_allocator import seat_allocator
+from services.seat_counters import adjust_seat_counters
 
 router = APIRouter(
 )
@@ -32,113 +47,121 @@ router = APIRouter(
 @router.post(
     "/initiate",
     response_model=BookingResponse,
+    dependencies=[Depends(admit_booking)],
     responses={
         400: {"model": ErrorResponse},
         401: {"model": ErrorResponse},
-        500: {"model": ErrorResponse}
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse}
     }
 )
 async def initiate_booking(
     request: BookingInitiateRequest,
-    db: Session = Depends(get_db),
-    token_data: dict = Depends(verify_token)
+    # Seat claims are conditional row updates with SKIP LOCKED, which stay
+    # correct under READ COMMITTED and avoid serializable predicate conflicts
+    db: AsyncSession = Depends(get_read_committed_db),
+    principal: Principal = Depends(get_current_principal),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER)
 ):
-    try:
-        # Calculate total amount (chỉ để kiểm tra)
-        total_amount = 0
-        for seat_request in request.seats_requested:
-            ticket_type = db.query(TicketType).filter(TicketType.id == seat_request.ticket_type_id).first()
-            if not ticket_type:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Ticket type {seat_request.ticket_type_id} not found"
-                )
-            total_amount += ticket_type.price * seat_request.quantity
-
-        # Create new booking
-        new_booking = Booking(
-            user_id=request.user_id,
-            status="pending",
-            time=datetime.now()
+    # Merge the requested quantities per ticket type
+    requested_quantities: Dict[int, int] = {}
+    for seat_request in request.seats_requested:
+        requested_quantities[seat_request.ticket_type_id] = (
+            requested_quantities.get(seat_request.ticket_type_id, 0) + seat_request.quantity
         )
-        db.add(new_booking)
-        db.flush()
-
-        # Process each seat request and create BookingDetail for each seat
-        for seat_request in request.seats_requested:
-            available_seats = db.query(Seat).filter(
-                Seat.ticket_type_id == seat_request.ticket_type_id,
-                Seat.is_available == True
-            ).with_for_update().order_by(Seat.id).limit(seat_request.quantity).all()
-
-            if len(available_seats) < seat_request.quantity:
-                db.rollback()
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Not enough available seats for ticket type {seat_request.ticket_type_id}"
-                )
 
-            for seat in available_seats:
-                booking_detail = BookingDetail(
-                    booking_id=new_booking.id,
-                    seat_id=seat.id,
-                    ticket_type_id=seat_request.ticket_type_id # Store ticket_type_id here
-                    # No quantity needed in BookingDetail model as per instruction
+    async def claim_booking():
+        claimed_seats: Dict[int, List[int]] = {}
+        try:
+            # Fetch every requested ticket type in one round trip
+            ticket_types = await get_ticket_types_by_id(db, requested_quantities.keys())
+            for ticket_type_id in requested_quantities:
+                if ticket_type_id not in ticket_types:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail=f"Ticket type {ticket_type_id} not found"
+                    )
+
+            # Create new booking
+            new_booking = Booking(
+                user_id=principal.id,
+                status="pending",
+                time=datetime.now(),
+                total_amount=sum(
+                    float(ticket_types[ticket_type_id].price) * quantity
+                    for ticket_type_id, quantity in requested_quantities.items()
                 )
-                db.add(booking_detail)
-                seat.is_available = False
-
-        db.commit()
-        
-        # Refresh to get the newly created booking details
-        db.refresh(new_booking)
-
-        # Aggregate booking details for the response
-        aggregated_details = db.query(
-            BookingDetail.ticket_type_id,
-            func.count(BookingDetail.id).label('quantity'),
-            TicketType.name,
-            TicketType.price
-        ).join(TicketType).filter(BookingDetail.booking_id == new_booking.id)
-        
-        # Group by ticket_type_id, name, and price
-        aggregated_details = aggregated_details.group_by(
-            BookingDetail.ticket_type_id,
-            TicketType.name,
-            TicketType.price
-        ).all()
-
-        # Construct the response in the new schema format
-        booking_response_data = {
-            "id": new_booking.id,
-            "user_id": new_booking.user_id,
-            "status": new_booking.status,
-            "time": new_booking.time,
-            "booking_details": []
-        }
-        
-        for detail in aggregated_details:
-            booking_response_data["booking_details"].append(
-                AggregatedBookingDetail(
-                    ticket_type=TicketTypeResponse(
-                        id=detail.ticket_type_id,
-                        name=detail.name,
-                        price=float(detail.price)
-                    ),
-                    quantity=detail.quantity
-                ).dict()
             )
-
+            db.add(new_booking)
+            await db.flush()
+
+            # Claim the seats for each ticket type from the in-memory allocator
+            await seat_allocator.ensure_loaded(db)
+            for ticket_type_id, quantity in requested_quantities.items():
+                seat_ids = await allocate_seats(db, ticket_type_id, quantity)
+                claimed_seats[ticket_type_id] = seat_ids
+                if len(seat_ids) < quantity:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Not enough available seats for ticket type {ticket_type_id}"
+                    )
+
+            await insert_booking_details(db, new_booking.id, claimed_seats, {
+                ticket_type_id: float(ticket_type.price) for ticket_type_id, ticket_type in ticket_types.items()
+            })
+            await adjust_seat_counters(db, {
+                ticket_type_id: -len(seat_ids) for ticket_type_id, seat_ids in claimed_seats.items()
+            })
+
+            # Construct the response (BookingResponse shape) from the claimed seats
+            booking_response_data = {
+                "id": new_booking.id,
+                "user_id": new_booking.user_id,
+                "status": new_booking.status,
+                "time": new_booking.time,
+                "booking_details": [
+                    {
+                        "ticket_type": {
+                            "id": ticket_type_id,
+                            "name": ticket_types[ticket_type_id].name,
+                            "price": float(ticket_types[ticket_type_id].price)
+                        },
+                        "quantity": len(seat_ids)
+                    }
+                    for ticket_type_id, seat_ids in claimed_seats.items()
+                ]
+            }
+
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            seat_allocator.release_seats(claimed_seats)
+            raise
+
+        seat_allocator.settle(
+            seat_id for seat_ids in claimed_seats.values() for seat_id in seat_ids
+        )
         return booking_response_data
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
-        )
+    async def initiate():
+        try:
+            return FastJSONResponse(await run_in_transaction(db, claim_booking, name="initiate_booking"))
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=str(e)
+            )
+
+    # Retries carrying the same Idempotency-Key replay the first response
+    # instead of claiming another set of seats
+    return await idempotency_store.run(
+        idempotency_key,
+        scope=f"{principal.id}:initiate",
+        handler=initiate,
+        payload=request
+    )
 
 @router.get(
     "/{booking_id}",
@@ -150,10 +173,10 @@ async def initiate_booking(
 )
 async def get_booking_details(
     booking_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_replica_db),
     token_data: dict = Depends(verify_token)
 ):
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    booking = await db.get(Booking, booking_id)
 
     if not booking:
         raise HTTPException(
@@ -162,42 +185,39 @@ async def get_booking_details(
         )
 
     # Aggregate booking details for the response
-    aggregated_details_query = db.query(
+    aggregated_details_query = select(
         BookingDetail.ticket_type_id,
         func.count(BookingDetail.id).label('quantity'),
         TicketType.name,
-        TicketType.price
-    ).join(TicketType).filter(BookingDetail.booking_id == booking_id)
+        BookingDetail.price
+    ).join(TicketType).where(BookingDetail.booking_id == booking_id)
     
-    # Group by ticket_type_id, name, and price
-    aggregated_details = aggregated_details_query.group_by(
+    # Group by ticket_type_id, name, and the price paid (not the current price)
+    result = await db.execute(aggregated_details_query.group_by(
         BookingDetail.ticket_type_id,
         TicketType.name,
-        TicketType.price
-    ).all()
-
-    # Construct the list of AggregatedBookingDetail Pydantic models
-    booking_details_list = []
-    for detail in aggregated_details:
-        booking_details_list.append(
-            AggregatedBookingDetail(
-                ticket_type=TicketTypeResponse(
-                    id=detail.ticket_type_id,
-                    name=detail.name,
-                    price=float(detail.price)
-                ),
-                quantity=detail.quantity
-            )
-        )
-
-    # Construct and return the BookingResponse Pydantic model
-    return BookingResponse(
-        id=booking.id,
-        user_id=booking.user_id,
-        status=booking.status,
-        time=booking.time,
-        booking_details=booking_details_list
-    )
+        BookingDetail.price
+    ))
+    aggregated_details = result.all()
+
+    # Build the BookingResponse shape directly and serialize it once
+    return FastJSONResponse({
+        "id": booking.id,
+        "user_id": booking.user_id,
+        "status": booking.status,
+        "time": booking.time,
+        "booking_details": [
+            {
+                "ticket_type": {
+                    "id": detail.ticket_type_id,
+                    "name": detail.name,
+                    "price": float(detail.price)
+                },
+                "quantity": detail.quantity
+            }
+            for detail in aggregated_details
+        ]
+    })
 
 @router.post(
     "/{booking_id}/confirm",
@@ -210,30 +230,40 @@ async def get_booking_details(
 )
 async def confirm_booking_payment(
     booking_id: int,
-    db: Session = Depends(get_db),
-    token_data: dict = Depends(verify_token)
+    db: AsyncSession = Depends(get_db),
+    token_data: dict = Depends(verify_token),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER)
 ):
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    async def confirm_booking():
+        booking = await db.get(Booking, booking_id)
 
-    if not booking:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Booking not found"
-        )
+        if not booking:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Booking not found"
+            )
 
-    if booking.status != "pending":
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Booking is not pending and cannot be confirmed"
+        if booking.status != "pending":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Booking is not pending and cannot be confirmed"
+            )
+
+        booking.status = "paid"
+        await apply_sales_rollup(db, [booking_id], 1)
+        await db.commit()
+        admin_booking_detail_cache.invalidate(booking_id)
+
+        return BookingStatusResponse(
+            id=booking.id,
+            status=booking.status,
+            message="Payment confirmed successfully"
         )
 
-    booking.status = "paid"
-    db.commit()
-    
-    return BookingStatusResponse(
-        id=booking.id,
-        status=booking.status,
-        message="Payment confirmed successfully"
+    return await idempotency_store.run(
+        idempotency_key,
+        scope=f"{token_data.get('sub')}:confirm:{booking_id}",
+        handler=lambda: run_in_transaction(db, confirm_booking, name="confirm_booking")
     )
 
 @router.post(
@@ -247,39 +277,45 @@ async def confirm_booking_payment(
 )
 async def cancel_booking(
     booking_id: int,
-    db: Session = Depends(get_db),
-    token_data: dict = Depends(verify_token)
+    db: AsyncSession = Depends(get_db),
+    token_data: dict = Depends(verify_token),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER)
 ):
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    async def cancel_pending_booking():
+        booking = await db.get(Booking, booking_id)
 
-    if not booking:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Booking not found"
-        )
+        if not booking:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Booking not found"
+            )
 
-    if booking.status != "pending":
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Only pending bookings can be canceled"
+        if booking.status != "pending":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Only pending bookings can be canceled"
+            )
+
+        # Update booking status to canceled
+        booking.status = "canceled"
+
+        # Release the seats back to available in one pass
+        released_seats = await release_booking_seats(db, [booking_id])
+
+        await db.commit()
+        seat_allocator.release_seats(released_seats)
+        admin_booking_detail_cache.invalidate(booking_id)
+
+        return BookingStatusResponse(
+            id=booking.id,
+            status=booking.status,
+            message="Booking canceled successfully"
         )
 
-    # Update booking status to canceled
-    booking.status = "canceled"
-    
-    # Release the seats back to available
-    booking_details = db.query(BookingDetail).filter(BookingDetail.booking_id == booking_id).all()
-    for detail in booking_details:
-        seat = db.query(Seat).filter(Seat.id == detail.seat_id).first()
-        if seat:
-            seat.is_available = True
-    
-    db.commit()
-    
-    return BookingStatusResponse(
-        id=booking.id,
-        status=booking.status,
-        message="Booking canceled successfully"
+    return await idempotency_store.run(
+        idempotency_key,
+        scope=f"{token_data.get('sub')}:cancel:{booking_id}",
+        handler=lambda: run_in_transaction(db, cancel_pending_booking, name="cancel_booking")
     )
 
 # Admin endpoints
@@ -292,36 +328,90 @@ async def cancel_booking(
     }
 )
 async def get_admin_booking_list(
-    db: Session = Depends(get_db),
+    sort: str = Query("time", regex="^(time|amount)$", description="Sort by booking time or total amount"),
+    order: str = Query("desc", regex="^(asc|desc)$"),
+    status_filter: Optional[str] = Query(None, alias="status", description="Only bookings in this status"),
+    created_from: Optional[datetime] = Query(None, description="Only bookings created at or after this time"),
+    created_to: Optional[datetime] = Query(None, description="Only bookings created before this time"),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    limit: int = Query(
+        settings.ADMIN_BOOKING_LIST_DEFAULT_LIMIT, ge=1, le=settings.ADMIN_BOOKING_LIST_MAX_LIMIT
+    ),
+    db: AsyncSession = Depends(get_replica_db),
     token_data: dict = Depends(verify_token)
 ):
-    """Get list of all bookings for admin dashboard"""
+    """Get a page of bookings for admin dashboard.
+
+    Pages are keyset-paginated on (sort key, id); when more rows follow, the
+    cursor for the next page is returned in the X-Next-Cursor header.
+    """
     try:
-        # Query bookings with user information and calculate total amount
-        bookings = db.query(
-            Booking,
+        sort_column = Booking.time if sort == "time" else Booking.total_amount
+        cursor_scope = f"{sort}:{order}"
+
+        # Stored total_amount keeps this a bookings/users join, so each page
+        # is an index range scan regardless of table size
+        query = select(
+            Booking.id,
             User.name.label('user_name'),
-            func.sum(TicketType.price).label('total_amount')
+            Booking.total_amount,
+            Booking.status,
+            Booking.time
         ).join(
             User, Booking.user_id == User.id
-        ).join(
-            BookingDetail, Booking.id == BookingDetail.booking_id
-        ).join(
-            TicketType, BookingDetail.ticket_type_id == TicketType.id
-        ).group_by(
-            Booking.id, User.name
-        ).all()
-
-        return [
-            AdminBookingListItem(
-                id=booking.Booking.id,
-                user_name=booking.user_name,
-                total_amount=float(booking.total_amount),
-                status=booking.Booking.status,
-                created_at=booking.Booking.time
+        )
+
+        if status_filter:
+            query = query.where(Booking.status == normalize_booking_status(status_filter))
+        if created_from:
+            query = query.where(Booking.time >= created_from)
+        if created_to:
+            query = query.where(Booking.time < created_to)
+
+        if cursor:
+            try:
+                cursor_key, cursor_id = decode_cursor(cursor, cursor_scope)
+                if sort == "time":
+                    cursor_key = datetime.fromisoformat(cursor_key)
+            except (InvalidCursor, TypeError, ValueError) as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Invalid cursor: {str(e)}"
+                )
+            position = tuple_(sort_column, Booking.id)
+            query = query.where(
+                position < tuple_(cursor_key, cursor_id) if order == "desc"
+                else position > tuple_(cursor_key, cursor_id)
+            )
+
+        if order == "desc":
+            query = query.order_by(sort_column.desc(), Booking.id.desc())
+        else:
+            query = query.order_by(sort_column.asc(), Booking.id.asc())
+
+        result = await db.execute(query.limit(limit))
+        bookings = result.all()
+
+        headers = {}
+        if len(bookings) == limit:
+            last = bookings[-1]
+            headers[NEXT_CURSOR_HEADER] = encode_cursor(
+                cursor_scope,
+                last.time if sort == "time" else last.total_amount,
+                last.id
             )
+
+        # AdminBookingListItem shape, serialized without re-validation
+        return FastJSONResponse([
+            {
+                "id": booking.id,
+                "user_name": booking.user_name,
+                "total_amount": float(booking.total_amount),
+                "status": booking.status,
+                "created_at": booking.time
+            }
             for booking in bookings
-        ]
+        ], headers=headers)
 
     except HTTPException:
         raise
@@ -331,6 +421,55 @@ async def get_admin_booking_list(
             detail=str(e)
         )
 
+async def load_admin_booking_detail(db: AsyncSession, booking_id: int) -> Optional[bytes]:
+    """Header, total and ticket breakdown of a booking from one grouped query,
+    rendered as an AdminBookingDetail body; None if the booking does not exist"""
+    result = await db.execute(select(
+        Booking.id,
+        Booking.status,
+        Booking.time,
+        Booking.total_amount,
+        User.name.label('user_name'),
+        User.email.label('user_email'),
+        TicketType.name.label('ticket_type'),
+        BookingDetail.price,
+        func.count(BookingDetail.id).label('quantity')
+    ).join(
+        User, Booking.user_id == User.id
+    ).outerjoin(
+        BookingDetail, Booking.id == BookingDetail.booking_id
+    ).outerjoin(
+        TicketType, BookingDetail.ticket_type_id == TicketType.id
+    ).where(
+        Booking.id == booking_id
+    ).group_by(
+        Booking.id, Booking.status, Booking.time, Booking.total_amount,
+        User.name, User.email, TicketType.id, TicketType.name, BookingDetail.price
+    ))
+    rows = result.all()
+    if not rows:
+        return None
+
+    # Every row repeats the booking header next to one ticket type
+    header = rows[0]
+    return dumps({
+        "id": header.id,
+        "user_name": header.user_name,
+        "user_email": header.user_email,
+        "total_amount": float(header.total_amount),
+        "status": header.status,
+        "created_at": header.time,
+        "tickets": [
+            {
+                "ticket_type": row.ticket_type,
+                "quantity": row.quantity,
+                "price": float(row.price)
+            }
+            for row in rows
+            if row.ticket_type is not None
+        ]
+    })
+
 @router.get(
     "/admin/{booking_id}",
     response_model=AdminBookingDetail,
@@ -342,64 +481,22 @@ async def get_admin_booking_list(
 )
 async def get_admin_booking_detail(
     booking_id: int,
-    db: Session = Depends(get_db),
+    # Primary, not the replica: the cache is invalidated on primary commits,
+    # so a reload from a lagging replica would be kept until the TTL
+    db: AsyncSession = Depends(get_read_committed_db),
     token_data: dict = Depends(verify_token)
 ):
     """Get detailed information of a booking for admin dashboard"""
     try:
-        # Query booking with all related information
-        booking = db.query(
-            Booking,
-            User.name.label('user_name'),
-            User.email.label('user_email'),
-            func.sum(TicketType.price).label('total_amount')
-        ).join(
-            User, Booking.user_id == User.id
-        ).join(
-            BookingDetail, Booking.id == BookingDetail.booking_id
-        ).join(
-            TicketType, BookingDetail.ticket_type_id == TicketType.id
-        ).filter(
-            Booking.id == booking_id
-        ).group_by(
-            Booking.id, User.name, User.email
-        ).first()
-
-        if not booking:
+        body = await admin_booking_detail_cache.get_or_load(
+            booking_id, lambda: load_admin_booking_detail(db, booking_id)
+        )
+        if body is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Booking not found"
             )
-
-        # Get ticket details
-        ticket_details = db.query(
-            TicketType.name,
-            TicketType.price,
-            func.count(BookingDetail.id).label('quantity')
-        ).join(
-            BookingDetail, TicketType.id == BookingDetail.ticket_type_id
-        ).filter(
-            BookingDetail.booking_id == booking_id
-        ).group_by(
-            TicketType.name, TicketType.price
-        ).all()
-
-        return AdminBookingDetail(
-            id=booking.Booking.id,
-            user_name=booking.user_name,
-            user_email=booking.user_email,
-            total_amount=float(booking.total_amount),
-            status=booking.Booking.status,
-            created_at=booking.Booking.time,
-            tickets=[
-                {
-                    "ticket_type": detail.name,
-                    "quantity": detail.quantity,
-                    "price": float(detail.price)
-                }
-                for detail in ticket_details
-            ]
-        )
+        return Response(content=body, media_type="application/json")
 
     except HTTPException:
         raise
@@ -421,22 +518,43 @@ async def get_admin_booking_detail(
 async def update_booking_status(
     booking_id: int,
     status_update: BookingUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     token_data: dict = Depends(verify_token)
 ):
     """Update booking status (admin only)"""
-    try:
-        booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    new_status = normalize_booking_status(status_update.status or "")
+
+    async def apply_status_update():
+        if not new_status:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Status is required"
+            )
+
+        booking = await db.get(Booking, booking_id)
         if not booking:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Booking not found"
             )
 
-        # Update status
-        booking.status = status_update.status
-        db.commit()
-        db.refresh(booking)
+        if booking.status == "canceled" and new_status != "canceled":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Canceled bookings cannot be reopened"
+            )
+
+        # Release the seats when an admin cancels the booking
+        released_seats: Dict[int, List[int]] = {}
+        if new_status == "canceled" and booking.status != "canceled":
+            released_seats = await release_booking_seats(db, [booking_id])
+
+        # Update status and move the booking in or out of the sales rollup
+        await apply_sales_rollup(db, [booking_id], sales_sign(booking.status, new_status))
+        booking.status = new_status
+        await db.commit()
+        seat_allocator.release_seats(released_seats)
+        admin_booking_detail_cache.invalidate(booking_id)
 
         return BookingStatusResponse(
             id=booking.id,
@@ -444,10 +562,124 @@ async def update_booking_status(
             message="Booking status updated successfully"
         )
 
+    try:
+        return await run_in_transaction(db, apply_status_update, name="update_booking_status")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+@router.post(
+    "/admin/status/bulk",
+    response_model=BulkBookingStatusResponse,
+    responses={
+        401: {"model": ErrorResponse},
+        403: {"model": ErrorResponse},
+        422: {"model": ErrorResponse},
+        500: {"model": ErrorResponse}
+    }
+)
+async def bulk_update_booking_status(
+    bulk_update: BulkBookingStatusUpdate,
+    db: AsyncSession = Depends(get_db),
+    principal: Principal = Depends(require_admin)
+):
+    """Update the status of many bookings in one pass (admin only)
+
+    Bookings are picked by id and/or filter, updated with one statement, and
+    seats of bookings moved to canceled are released in the same transaction.
+    Requested ids the filters exclude are reported as not matching them;
+    requests with more booking_ids than `limit` are rejected.
+    """
+    # Validated and normalized by BulkBookingStatusUpdate
+    target_status = bulk_update.status
+
+    async def apply_bulk_update():
+        query = select(Booking.id, Booking.status).order_by(Booking.id).limit(bulk_update.limit)
+        if bulk_update.booking_ids is not None:
+            query = query.where(Booking.id.in_(bulk_update.booking_ids))
+        if bulk_update.current_status:
+            query = query.where(Booking.status == bulk_update.current_status)
+        if bulk_update.created_from:
+            query = query.where(Booking.time >= bulk_update.created_from)
+        if bulk_update.created_to:
+            query = query.where(Booking.time < bulk_update.created_to)
+
+        result = await db.execute(query.with_for_update())
+        current_statuses = dict(result.all())
+
+        # Requested ids not selected either do not exist or were excluded by the filters
+        missing_ids = [
+            booking_id for booking_id in dict.fromkeys(bulk_update.booking_ids or [])
+            if booking_id not in current_statuses
+        ]
+        filtered_out = set()
+        if missing_ids and (bulk_update.current_status or bulk_update.created_from or bulk_update.created_to):
+            filtered_out = set((await db.execute(
+                select(Booking.id).where(Booking.id.in_(missing_ids))
+            )).scalars().all())
+
+        results: Dict[int, BulkBookingStatusResult] = {}
+        to_update: List[int] = []
+        for booking_id, current_status in current_statuses.items():
+            if current_status == target_status:
+                message = f"Booking is already {target_status}"
+            elif current_status == "canceled":
+                message = "Canceled bookings cannot be reopened"
+            else:
+                to_update.append(booking_id)
+                continue
+            results[booking_id] = BulkBookingStatusResult(
+                id=booking_id, status=current_status, updated=False, message=message
+            )
+
+        released_seats: Dict[int, List[int]] = {}
+        if to_update:
+            await db.execute(
+                update(Booking)
+                .where(Booking.id.in_(to_update))
+                .values(status=target_status)
+                .execution_options(synchronize_session=False)
+            )
+            if target_status == "canceled":
+                released_seats = await release_booking_seats(db, to_update)
+            for sign in (1, -1):
+                await apply_sales_rollup(db, [
+                    booking_id for booking_id in to_update
+                    if sales_sign(current_statuses[booking_id], target_status) == sign
+                ], sign)
+        await db.commit()
+        seat_allocator.release_seats(released_seats)
+        admin_booking_detail_cache.invalidate(*to_update)
+
+        for booking_id in to_update:
+            results[booking_id] = BulkBookingStatusResult(
+                id=booking_id,
+                status=target_status,
+                updated=True,
+                message="Booking status updated successfully"
+            )
+        for booking_id in missing_ids:
+            results[booking_id] = BulkBookingStatusResult(
+                id=booking_id,
+                updated=False,
+                message="Booking does not match the filter" if booking_id in filtered_out else "Booking not found"
+            )
+
+        return BulkBookingStatusResponse(
+            updated=len(to_update),
+            has_more=len(current_statuses) == bulk_update.limit,
+            results=list(results.values())
+        )
+
+    try:
+        return await run_in_transaction(db, apply_bulk_update, name="bulk_update_booking_status")
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
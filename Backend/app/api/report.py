@@ -0,0 +1,101 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+import traceback
+import logging
+
+from database import get_replica_db
+from models.sales_rollup import SalesRollup
+from models.ticket_type import TicketType
+from schemas.report import SalesReportResponse
+from api.auth import require_admin
+from services.principal import Principal
+from services.sales_rollup import bucket_start
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.get("/sales", response_model=SalesReportResponse)
+async def get_sales_report(
+    date_from: datetime = Query(..., description="Bookings made at or after this time (rounded down to the hour)"),
+    date_to: datetime = Query(..., description="Bookings made before this time"),
+    granularity: str = Query("total", regex="^(total|day|hour)$"),
+    ticket_type_id: Optional[int] = Query(None, description="Only this ticket type"),
+    db: AsyncSession = Depends(get_replica_db),
+    principal: Principal = Depends(require_admin)
+):
+    """Paid tickets and revenue (at booking-time prices) per ticket type (admin only).
+
+    Reads the hourly sales_rollups table only, so the cost depends on the
+    number of buckets in range, never on the number of bookings.
+    """
+    if date_to <= date_from:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_to must be after date_from"
+        )
+
+    try:
+        columns = [
+            TicketType.id,
+            TicketType.name,
+            func.sum(SalesRollup.tickets_sold),
+            func.sum(SalesRollup.revenue)
+        ]
+        group_by = [TicketType.id, TicketType.name]
+        if granularity == "hour":
+            bucket = SalesRollup.bucket_start
+        elif granularity == "day":
+            bucket = func.date(SalesRollup.bucket_start)
+        else:
+            bucket = None
+        if bucket is not None:
+            columns.insert(0, bucket.label("bucket"))
+            group_by.insert(0, bucket)
+
+        query = select(*columns).join(
+            TicketType, SalesRollup.ticket_type_id == TicketType.id
+        ).where(
+            SalesRollup.bucket_start >= bucket_start(date_from),
+            SalesRollup.bucket_start < date_to
+        )
+        if ticket_type_id is not None:
+            query = query.where(SalesRollup.ticket_type_id == ticket_type_id)
+
+        result = await db.execute(query.group_by(*group_by).order_by(*group_by))
+
+        rows = []
+        for row in result:
+            if bucket is not None:
+                bucket_value, *row = row
+                # SQLite returns date() as text
+                if not isinstance(bucket_value, datetime):
+                    bucket_value = datetime.fromisoformat(str(bucket_value))
+            else:
+                bucket_value = None
+            row_ticket_type_id, name, tickets_sold, revenue = row
+            rows.append({
+                "bucket_start": bucket_value,
+                "ticket_type_id": row_ticket_type_id,
+                "ticket_type_name": name,
+                "tickets_sold": int(tickets_sold or 0),
+                "revenue": float(revenue or 0)
+            })
+
+        return {
+            "date_from": date_from,
+            "date_to": date_to,
+            "granularity": granularity,
+            "tickets_sold": sum(row["tickets_sold"] for row in rows),
+            "revenue": sum(row["revenue"] for row in rows),
+            "rows": rows
+        }
+    except Exception as e:
+        logger.error(f"Error building sales report: {str(e)}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
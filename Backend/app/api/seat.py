@@ -1,27 +1,108 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 import traceback
 import logging
 
-from database import get_db
+from core.cache import SnapshotCache
+from core.conditional import catalog_version
+from core.config import settings
+from core.responses import FastJSONResponse, dumps
+from database import AsyncSessionLocal, READ_COMMITTED, bind_with_isolation, get_db, get_read_committed_db, get_replica_db
 from models.seat import Seat
 from models.ticket_type import TicketType
 from schemas.seat import SeatCreate, SeatUpdate, SeatResponse, SeatCountResponse, TicketTypeSeatCount, BulkSeatCreate
-from api.auth import verify_token
+from api.auth import verify_stream_ticket, verify_token
+from models.seat_counter import SeatCounter
+from services.availability import availability_broadcaster
+from services.seat_allocator import seat_allocator
+from services.seat_counters import adjust_seat_counters, on_seat_counters_committed
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# The admin dashboard polls /seats/count; serve it from a short-lived snapshot
+# that is dropped whenever a booking, cancel or seat write commits
+seat_counts_snapshot = SnapshotCache(ttl_seconds=settings.SEAT_COUNTS_SNAPSHOT_TTL_SECONDS)
+on_seat_counters_committed(lambda changes: seat_counts_snapshot.invalidate())
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NEXT_AFTER_ID_HEADER = "X-Next-After-Id"
+
+def seat_listing_query(
+    after_id: Optional[int],
+    ticket_type_id: Optional[int],
+    is_available: Optional[bool]
+):
+    """Seat columns in id order, starting after `after_id`"""
+    query = select(Seat.id, Seat.ticket_type_id, Seat.is_available).order_by(Seat.id)
+    if after_id is not None:
+        query = query.where(Seat.id > after_id)
+    if ticket_type_id is not None:
+        query = query.where(Seat.ticket_type_id == ticket_type_id)
+    if is_available is not None:
+        query = query.where(Seat.is_available == is_available)
+    return query
+
+def seat_row_to_dict(row) -> dict:
+    return {"id": row.id, "ticket_type_id": row.ticket_type_id, "is_available": row.is_available}
+
+async def stream_seats_ndjson(query):
+    """Yield one JSON line per seat, reading the rows through a server-side
+    cursor in batches of SEAT_STREAM_BATCH_SIZE"""
+    # The request's session may be closed before the body is sent, so the
+    # stream owns its session
+    async with AsyncSessionLocal(bind=bind_with_isolation(READ_COMMITTED)) as db:
+        try:
+            result = await db.stream(query.execution_options(yield_per=settings.SEAT_STREAM_BATCH_SIZE))
+            async for rows in result.partitions():
+                yield b"".join(dumps(seat_row_to_dict(row)) + b"\n" for row in rows)
+        except Exception as e:
+            # Headers are already sent, so the client only sees a truncated body
+            logger.error(f"Error streaming seats: {str(e)}")
+            logger.error(traceback.format_exc())
+            raise
+
+async def list_seats(
+    db: AsyncSession,
+    after_id: Optional[int],
+    limit: Optional[int],
+    ticket_type_id: Optional[int],
+    is_available: Optional[bool],
+    stream: bool
+):
+    query = seat_listing_query(after_id, ticket_type_id, is_available)
+
+    if stream:
+        # Streams every matching seat unless a limit is given
+        if limit is not None:
+            query = query.limit(limit)
+        return StreamingResponse(stream_seats_ndjson(query), media_type=NDJSON_MEDIA_TYPE)
+
+    limit = limit or settings.SEAT_LIST_DEFAULT_LIMIT
+    result = await db.execute(query.limit(limit))
+    seats = [seat_row_to_dict(row) for row in result]
+    headers = {}
+    # A full page means there may be more; the client passes this back as after_id
+    if len(seats) == limit:
+        headers[NEXT_AFTER_ID_HEADER] = str(seats[-1]["id"])
+    # Rows are already in SeatResponse shape; skip response_model re-validation
+    return FastJSONResponse(seats, headers=headers)
+
 @router.get("/", response_model=List[SeatResponse])
 async def get_seats(
-    db: Session = Depends(get_db),
+    after_id: Optional[int] = Query(None, ge=0, description="Return seats with an id greater than this"),
+    limit: Optional[int] = Query(None, ge=1, le=settings.SEAT_LIST_MAX_LIMIT, description="Page size"),
+    ticket_type_id: Optional[int] = Query(None, description="Only seats of this ticket type"),
+    is_available: Optional[bool] = Query(None, description="Only available or only unavailable seats"),
+    stream: bool = Query(False, description="Stream all matching seats as NDJSON"),
+    db: AsyncSession = Depends(get_replica_db),
     token_data: dict = Depends(verify_token)
 ):
     try:
-        seats = db.query(Seat).all()
-        # Chuyển đổi rõ ràng từ model sang schema
-        return [SeatResponse.from_orm(seat) for seat in seats]
+        return await list_seats(db, after_id, limit, ticket_type_id, is_available, stream)
     except Exception as e:
         logger.error(f"Error getting seats: {str(e)}")
         logger.error(traceback.format_exc())
@@ -30,43 +111,47 @@ async def get_seats(
             detail="Internal server error"
         )
 
+@router.get("/stream")
+async def stream_seat_availability(token_data: dict = Depends(verify_stream_ticket)):
+    """Server-Sent Events stream of available seats per ticket type.
+
+    Starts with a `snapshot` event, then sends `availability` events holding
+    the new count and delta of each ticket type that changed, coalesced over
+    AVAILABILITY_STREAM_WINDOW_SECONDS.
+
+    Opened with `?ticket=` from POST /auth/stream-ticket; tickets are single
+    use, so clients fetch a new one before reconnecting.
+    """
+    return StreamingResponse(
+        availability_broadcaster.subscribe(settings.AVAILABILITY_STREAM_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Stop nginx from buffering the stream
+            "X-Accel-Buffering": "no"
+        }
+    )
+
 @router.get("/count", response_model=SeatCountResponse)
 async def get_seat_counts(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    # Primary, not the replica: the snapshot and ETag are reset on primary
+    # commits, so a lagging replica would be cached under the new version
+    db: AsyncSession = Depends(get_read_committed_db),
     token_data: dict = Depends(verify_token)
 ):
     try:
-        # Get total counts
-        total_seats = db.query(Seat).count()
-        available_seats = db.query(Seat).filter(Seat.is_available == True).count()
-        not_available_seats = total_seats - available_seats
-
-        # Get counts by ticket type
-        ticket_types = db.query(TicketType).all()
-        ticket_type_counts = []
-        
-        for ticket_type in ticket_types:
-            total = db.query(Seat).filter(Seat.ticket_type_id == ticket_type.id).count()
-            available = db.query(Seat).filter(
-                Seat.ticket_type_id == ticket_type.id,
-                Seat.is_available == True
-            ).count()
-            
-            ticket_type_counts.append(TicketTypeSeatCount(
-                ticket_type_id=ticket_type.id,
-                ticket_type_name=ticket_type.name,
-                total_seats=total,
-                available_seats=available,
-                not_available_seats=total - available
-            ))
-
-        # Tạo response rõ ràng
-        return SeatCountResponse(
-            total_seats=total_seats,
-            available_seats=available_seats,
-            not_available_seats=not_available_seats,
-            ticket_type_counts=ticket_type_counts
-        )
+        # Validators are taken before loading, so a racing write can only
+        # make them older than the body, never newer
+        not_modified = catalog_version.not_modified_response(request, response)
+        if not_modified:
+            return not_modified
+
+        seat_counts, age = await seat_counts_snapshot.get_or_load(lambda: load_seat_counts(db))
+        response.headers["Age"] = str(int(age))
+        response.headers["X-Snapshot-Age"] = f"{age:.3f}"
+        return seat_counts
     except Exception as e:
         logger.error(f"Error getting seat counts: {str(e)}")
         logger.error(traceback.format_exc())
@@ -75,22 +160,66 @@ async def get_seat_counts(
             detail="Internal server error"
         )
 
+async def load_seat_counts(db: AsyncSession) -> SeatCountResponse:
+    """Build the seat count breakdown from the counters in one query"""
+    # Read the per ticket type counters
+    result = await db.execute(
+        select(
+            TicketType.id,
+            TicketType.name,
+            func.coalesce(SeatCounter.total_seats, 0),
+            func.coalesce(SeatCounter.available_seats, 0)
+        )
+        .outerjoin(SeatCounter, SeatCounter.ticket_type_id == TicketType.id)
+        .order_by(TicketType.id)
+    )
+    ticket_type_counts = []
+    
+    for ticket_type_id, ticket_type_name, total, available in result:
+        ticket_type_counts.append(TicketTypeSeatCount(
+            ticket_type_id=ticket_type_id,
+            ticket_type_name=ticket_type_name,
+            total_seats=total,
+            available_seats=available,
+            not_available_seats=total - available
+        ))
+
+    # Get total counts
+    total_seats = sum(count.total_seats for count in ticket_type_counts)
+    available_seats = sum(count.available_seats for count in ticket_type_counts)
+    not_available_seats = total_seats - available_seats
+
+    # Tạo response rõ ràng
+    return SeatCountResponse(
+        total_seats=total_seats,
+        available_seats=available_seats,
+        not_available_seats=not_available_seats,
+        ticket_type_counts=ticket_type_counts
+    )
+
 @router.post("/", response_model=SeatResponse)
 async def create_seat(
     seat: SeatCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     token_data: dict = Depends(verify_token)
 ):
     try:
         db_seat = Seat(**seat.dict())
         db.add(db_seat)
-        db.commit()
-        db.refresh(db_seat)
+        await adjust_seat_counters(
+            db,
+            {seat.ticket_type_id: int(seat.is_available)},
+            {seat.ticket_type_id: 1}
+        )
+        await db.commit()
+        await db.refresh(db_seat)
+        if db_seat.is_available:
+            seat_allocator.release(db_seat.ticket_type_id, [db_seat.id])
         return SeatResponse.from_orm(db_seat)
     except Exception as e:
         logger.error(f"Error creating seat: {str(e)}")
         logger.error(traceback.format_exc())
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error"
@@ -99,7 +228,7 @@ async def create_seat(
 @router.post("/bulk", response_model=List[SeatResponse])
 async def create_bulk_seats(
     bulk_seat: BulkSeatCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     token_data: dict = Depends(verify_token)
 ):
     try:
@@ -114,17 +243,23 @@ async def create_bulk_seats(
         
         # Add all seats at once
         db.add_all(seats)
-        db.commit()
+        await adjust_seat_counters(
+            db,
+            {bulk_seat.ticket_type_id: bulk_seat.quantity if bulk_seat.is_available else 0},
+            {bulk_seat.ticket_type_id: bulk_seat.quantity}
+        )
+        await db.commit()
         
-        # Refresh all seats to get their IDs
-        for seat in seats:
-            db.refresh(seat)
+        # Seat ids are populated on flush and kept since commit does not expire them
+
+        if bulk_seat.is_available:
+            seat_allocator.release(bulk_seat.ticket_type_id, [seat.id for seat in seats])
             
         return [SeatResponse.from_orm(seat) for seat in seats]
     except Exception as e:
         logger.error(f"Error creating bulk seats: {str(e)}")
         logger.error(traceback.format_exc())
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error"
@@ -134,30 +269,47 @@ async def create_bulk_seats(
 async def update_seat(
     seat_id: int,
     seat_update: SeatUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     token_data: dict = Depends(verify_token)
 ):
     try:
-        seat = db.query(Seat).filter(Seat.id == seat_id).first()
+        seat = await db.get(Seat, seat_id)
         if not seat:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Seat not found"
             )
 
+        old_ticket_type_id, old_is_available = seat.ticket_type_id, bool(seat.is_available)
+
         update_data = seat_update.dict(exclude_unset=True)
         for key, value in update_data.items():
             setattr(seat, key, value)
 
-        db.commit()
-        db.refresh(seat)
+        # Move the seat between counters
+        available_deltas = {old_ticket_type_id: -int(old_is_available)}
+        available_deltas[seat.ticket_type_id] = (
+            available_deltas.get(seat.ticket_type_id, 0) + int(bool(seat.is_available))
+        )
+        total_deltas = {}
+        if seat.ticket_type_id != old_ticket_type_id:
+            total_deltas = {old_ticket_type_id: -1, seat.ticket_type_id: 1}
+        await adjust_seat_counters(db, available_deltas, total_deltas)
+
+        await db.commit()
+        await db.refresh(seat)
+
+        # Keep the allocator in line with the new availability and ticket type
+        seat_allocator.discard([seat.id])
+        if seat.is_available:
+            seat_allocator.release(seat.ticket_type_id, [seat.id])
         return SeatResponse.from_orm(seat)
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error updating seat: {str(e)}")
         logger.error(traceback.format_exc())
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error"
@@ -166,19 +318,25 @@ async def update_seat(
 @router.delete("/{seat_id}")
 async def delete_seat(
     seat_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     token_data: dict = Depends(verify_token)
 ):
     try:
-        seat = db.query(Seat).filter(Seat.id == seat_id).first()
+        seat = await db.get(Seat, seat_id)
         if not seat:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Seat not found"
             )
 
-        db.delete(seat)
-        db.commit()
+        await adjust_seat_counters(
+            db,
+            {seat.ticket_type_id: -int(bool(seat.is_available))},
+            {seat.ticket_type_id: -1}
+        )
+        await db.delete(seat)
+        await db.commit()
+        seat_allocator.discard([seat_id])
         return {"message": "Seat deleted successfully"}
 
     except HTTPException:
@@ -186,7 +344,7 @@ async def delete_seat(
     except Exception as e:
         logger.error(f"Error deleting seat: {str(e)}")
         logger.error(traceback.format_exc())
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error"
@@ -194,12 +352,15 @@ async def delete_seat(
 
 @router.get("/available", response_model=List[SeatResponse])
 async def get_available_seats(
-    db: Session = Depends(get_db),
+    after_id: Optional[int] = Query(None, ge=0, description="Return seats with an id greater than this"),
+    limit: Optional[int] = Query(None, ge=1, le=settings.SEAT_LIST_MAX_LIMIT, description="Page size"),
+    ticket_type_id: Optional[int] = Query(None, description="Only seats of this ticket type"),
+    stream: bool = Query(False, description="Stream all available seats as NDJSON"),
+    db: AsyncSession = Depends(get_replica_db),
     token_data: dict = Depends(verify_token)
 ):
     try:
-        seats = db.query(Seat).filter(Seat.is_available == True).all()
-        return seats
+        return await list_seats(db, after_id, limit, ticket_type_id, True, stream)
     except Exception as e:
         logger.error(f"Error getting available seats: {str(e)}")
         logger.error(traceback.format_exc())
@@ -1,34 +1,66 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import delete, exists, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 import traceback
 import logging
 
-from database import get_db
+from database import get_db, get_read_committed_db
+from models.bookingdetail import BookingDetail
+from models.sales_rollup import SalesRollup
+from models.seat import Seat
+from models.seat_counter import SeatCounter
 from models.ticket_type import TicketType
 from schemas.ticket_type import TicketTypeCreate, TicketTypeUpdate, TicketTypeResponse
 from api.auth import verify_token
-from core.config import settings
+from core.conditional import catalog_version
+from services.booking import admin_booking_detail_cache
+from services.seat_allocator import seat_allocator
+from services.seat_counters import create_seat_counter, delete_seat_counter, mark_seat_counters_changed
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+def ticket_type_rows_query():
+    """id, name, price and available_quantity per ticket type, read from the
+    seat counters so seat rows are never loaded"""
+    return (
+        select(
+            TicketType.id,
+            TicketType.name,
+            TicketType.price,
+            func.coalesce(SeatCounter.available_seats, 0).label("available_quantity")
+        )
+        .outerjoin(SeatCounter, SeatCounter.ticket_type_id == TicketType.id)
+    )
+
+def ticket_type_row_to_dict(row) -> dict:
+    return {
+        "id": row.id,
+        "name": row.name,
+        "price": row.price,
+        "available_quantity": row.available_quantity
+    }
+
+async def get_ticket_type_row(db: AsyncSession, ticket_type_id: int):
+    result = await db.execute(ticket_type_rows_query().where(TicketType.id == ticket_type_id))
+    return result.first()
+
 @router.get("/", response_model=List[TicketTypeResponse])
 async def get_ticket_types(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    # Primary: the ETag is bumped on primary commits (see get_seat_counts)
+    db: AsyncSession = Depends(get_read_committed_db),
     token_data: dict = Depends(verify_token)
 ):
     try:
-        ticket_types = db.query(TicketType).all()
-        return [
-            {
-                "id": ticket_type.id,
-                "name": ticket_type.name,
-                "price": ticket_type.price,
-                "available_quantity": sum(1 for seat in ticket_type.seats if seat.is_available)
-            }
-            for ticket_type in ticket_types
-        ]
+        not_modified = catalog_version.not_modified_response(request, response)
+        if not_modified:
+            return not_modified
+
+        result = await db.execute(ticket_type_rows_query().order_by(TicketType.id))
+        return [ticket_type_row_to_dict(row) for row in result]
     except Exception as e:
         logger.error(f"Error getting ticket types: {str(e)}")
         logger.error(traceback.format_exc())
@@ -40,7 +72,7 @@ async def get_ticket_types(
 @router.post("/", response_model=TicketTypeResponse)
 async def create_ticket_type(
     ticket_type: TicketTypeCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     token_data: dict = Depends(verify_token)
 ):
     try:
@@ -64,7 +96,8 @@ async def create_ticket_type(
             )
 
         # Check if ticket type with same name already exists
-        existing_ticket_type = db.query(TicketType).filter(TicketType.name == ticket_type.name).first()
+        result = await db.execute(select(TicketType).where(TicketType.name == ticket_type.name))
+        existing_ticket_type = result.scalars().first()
         if existing_ticket_type:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -78,8 +111,10 @@ async def create_ticket_type(
                 price=round(ticket_type.price, 2)
             )
             db.add(new_ticket_type)
-            db.commit()
-            db.refresh(new_ticket_type)
+            await db.flush()
+            await create_seat_counter(db, new_ticket_type.id)
+            await db.commit()
+            await db.refresh(new_ticket_type)
 
             return {
                 "id": new_ticket_type.id,
@@ -88,7 +123,7 @@ async def create_ticket_type(
                 "available_quantity": 0
             }
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Database error while creating ticket type: {str(e)}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -108,21 +143,24 @@ async def create_ticket_type(
 @router.get("/{ticket_type_id}", response_model=TicketTypeResponse)
 async def get_ticket_type(
     ticket_type_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    # Primary: the ETag is bumped on primary commits (see get_seat_counts)
+    db: AsyncSession = Depends(get_read_committed_db),
     token_data: dict = Depends(verify_token)
 ):
     try:
-        ticket_type = db.query(TicketType).filter(TicketType.id == ticket_type_id).first()
-        if not ticket_type:
+        not_modified = catalog_version.not_modified_response(request, response)
+        if not_modified:
+            return not_modified
+
+        row = await get_ticket_type_row(db, ticket_type_id)
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Ticket type not found"
             )
-        return {
-            "id": ticket_type.id,
-            "name": ticket_type.name,
-            "price": ticket_type.price
-        }
+        return ticket_type_row_to_dict(row)
     except HTTPException:
         raise
     except Exception as e:
@@ -137,12 +175,12 @@ async def get_ticket_type(
 async def update_ticket_type(
     ticket_type_id: int,
     ticket_type_update: TicketTypeUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     token_data: dict = Depends(verify_token)
 ):
     try:
         # Check if ticket type exists
-        ticket_type = db.query(TicketType).filter(TicketType.id == ticket_type_id).first()
+        ticket_type = await db.get(TicketType, ticket_type_id)
         if not ticket_type:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -151,10 +189,11 @@ async def update_ticket_type(
 
         # If name is being updated, check for duplicates
         if ticket_type_update.name and ticket_type_update.name != ticket_type.name:
-            existing_ticket_type = db.query(TicketType).filter(
+            result = await db.execute(select(TicketType).where(
                 TicketType.name == ticket_type_update.name,
                 TicketType.id != ticket_type_id
-            ).first()
+            ))
+            existing_ticket_type = result.scalars().first()
             if existing_ticket_type:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -166,23 +205,23 @@ async def update_ticket_type(
         for key, value in update_data.items():
             setattr(ticket_type, key, value)
 
+        # Listings that show the ticket type name need refreshing
+        mark_seat_counters_changed(db, {ticket_type_id: 0})
+
         try:
-            db.commit()
-            db.refresh(ticket_type)
+            await db.commit()
+            # Booking details show ticket type names and prices
+            admin_booking_detail_cache.clear()
+            row = await get_ticket_type_row(db, ticket_type_id)
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Database error while updating ticket type: {str(e)}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to update ticket type in database"
             )
 
-        return {
-            "id": ticket_type.id,
-            "name": ticket_type.name,
-            "price": ticket_type.price,
-            "available_quantity": sum(1 for seat in ticket_type.seats if seat.is_available)
-        }
+        return ticket_type_row_to_dict(row)
     except HTTPException:
         raise
     except Exception as e:
@@ -196,38 +235,52 @@ async def update_ticket_type(
 @router.delete("/{ticket_type_id}")
 async def delete_ticket_type(
     ticket_type_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     token_data: dict = Depends(verify_token)
 ):
     try:
         # Check if ticket type exists
-        ticket_type = db.query(TicketType).filter(TicketType.id == ticket_type_id).first()
+        ticket_type = await db.get(TicketType, ticket_type_id)
         if not ticket_type:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Ticket type not found"
             )
 
-        # Check if ticket type has associated seats
-        if ticket_type.seats:
-            # Check if any seats are booked
-            booked_seats = [seat for seat in ticket_type.seats if not seat.is_available]
-            if booked_seats:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Cannot delete ticket type with booked seats"
-                )
+        # Check if any seats are booked
+        has_booked_seats = await db.scalar(
+            select(exists().where(Seat.ticket_type_id == ticket_type_id, Seat.is_available == False))
+        )
+        if has_booked_seats:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot delete ticket type with booked seats"
+            )
 
         try:
-            # Delete associated seats first
-            for seat in ticket_type.seats:
-                db.delete(seat)
-            
+            # Delete booking history and seats with set-based statements
+            # instead of loading every seat
+            seat_ids = select(Seat.id).where(Seat.ticket_type_id == ticket_type_id)
+            await db.execute(
+                delete(BookingDetail)
+                .where(or_(BookingDetail.ticket_type_id == ticket_type_id, BookingDetail.seat_id.in_(seat_ids)))
+                .execution_options(synchronize_session=False)
+            )
+            await db.execute(delete(SalesRollup).where(SalesRollup.ticket_type_id == ticket_type_id))
+            await db.execute(
+                delete(Seat)
+                .where(Seat.ticket_type_id == ticket_type_id)
+                .execution_options(synchronize_session=False)
+            )
+
             # Delete ticket type
-            db.delete(ticket_type)
-            db.commit()
+            await delete_seat_counter(db, ticket_type_id)
+            await db.execute(delete(TicketType).where(TicketType.id == ticket_type_id))
+            await db.commit()
+            seat_allocator.drop_ticket_type(ticket_type_id)
+            admin_booking_detail_cache.clear()
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Database error while deleting ticket type: {str(e)}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -0,0 +1,116 @@
+"""Admin booking list benchmark: page latency as the bookings table grows.
+
+Seeds a scratch database with an increasing number of bookings and times
+`get_admin_booking_list` for the first page, a page half-way through (reached
+with a cursor) and a status-filtered page, sorted by time and by amount.
+With the keyset indexes every column should stay flat across sizes.
+
+Run from Backend/app, e.g.:
+    python benchmarks/bench_admin_booking_list.py --bookings 10000 100000 1000000
+
+Uses a throwaway SQLite file by default; pass --database-url to point it at
+an empty PostgreSQL database instead (its tables are dropped and recreated).
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from database import Base, get_async_database_url
+from api.booking import get_admin_booking_list
+from core.pagination import encode_cursor
+from models.booking import Booking
+from models.user import User
+import models.bookingdetail, models.seat, models.seat_counter, models.ticket_type  # noqa: F401
+
+STATUSES = ("pending", "paid", "canceled")
+CHUNK = 50000
+
+
+async def seed(engine, session_factory, bookings: int):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    start = datetime(2024, 1, 1)
+    async with session_factory() as db:
+        await db.execute(insert(User), [{
+            "id": 1, "name": "Bench", "email": "bench@example.com", "date_of_birth": start.date(),
+            "phone_number": "0000000000", "type": "admin", "hashed_password": "x"
+        }])
+        for offset in range(0, bookings, CHUNK):
+            await db.execute(insert(Booking), [
+                {
+                    "user_id": 1,
+                    "status": STATUSES[i % len(STATUSES)],
+                    "time": start + timedelta(seconds=i),
+                    "total_amount": float((i * 7919) % 1000)
+                }
+                for i in range(offset, min(offset + CHUNK, bookings))
+            ])
+        await db.commit()
+
+
+async def time_page(session_factory, repeat: int, **params) -> float:
+    arguments = {
+        "sort": "time", "order": "desc", "status_filter": None, "created_from": None,
+        "created_to": None, "cursor": None, "limit": 50
+    }
+    arguments.update(params)
+    latencies = []
+    for _ in range(repeat):
+        async with session_factory() as db:
+            started = time.perf_counter()
+            response = await get_admin_booking_list(db=db, token_data={}, **arguments)
+            latencies.append(time.perf_counter() - started)
+            assert len(json.loads(response.body)) == arguments["limit"]
+    return statistics.median(latencies) * 1000
+
+
+async def main(args):
+    engine = create_async_engine(get_async_database_url(args.database_url))
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    print(f"{'bookings':>9}  {'time first':>10} {'time mid':>9} {'amount mid':>10} {'status mid':>10}  (p50 ms)")
+    for bookings in args.bookings:
+        await seed(engine, session_factory, bookings)
+        middle_time = datetime(2024, 1, 1) + timedelta(seconds=bookings // 2)
+        row = [
+            await time_page(session_factory, args.repeat),
+            await time_page(
+                session_factory, args.repeat,
+                cursor=encode_cursor("time:desc", middle_time, bookings // 2)
+            ),
+            await time_page(
+                session_factory, args.repeat, sort="amount",
+                cursor=encode_cursor("amount:desc", 500.0, bookings // 2)
+            ),
+            await time_page(
+                session_factory, args.repeat, status_filter="paid",
+                cursor=encode_cursor("time:desc", middle_time, bookings // 2)
+            ),
+        ]
+        print(f"{bookings:9d}  " + " ".join(f"{value:10.2f}" for value in row))
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bookings", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", default="sqlite:///./bench_admin_bookings.db")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    asyncio.run(main(args))
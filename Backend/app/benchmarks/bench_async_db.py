@@ -0,0 +1,119 @@
+"""Concurrency benchmark: blocking Session vs AsyncSession inside async routes.
+
+Serves the same query through two routes, one using the sync SessionLocal
+(how every router worked before) and one using AsyncSessionLocal, and fires
+concurrent requests at each through the ASGI app.
+
+Run from Backend/app against the configured DATABASE_URL, e.g.:
+    python benchmarks/bench_async_db.py --requests 500 --concurrency 50 --latency 0.01
+
+Each query sleeps `--latency` seconds inside the database to model
+network/database time: pg_sleep on PostgreSQL, a registered sleep() function
+on SQLite. With --latency 0, SQLite runs a plain seat count.
+
+Needs httpx (requirements-dev.txt).
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import event, func, select, text
+
+from database import AsyncSessionLocal, Base, SessionLocal, async_engine, engine
+from models.seat import Seat
+import models.booking, models.bookingdetail, models.ticket_type, models.user  # noqa: F401
+
+
+def _register_sqlite_sleep(dbapi_connection, connection_record):
+    dbapi_connection.create_function("sleep", 1, lambda seconds: time.sleep(seconds) or 0)
+
+
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", _register_sqlite_sleep)
+    event.listen(async_engine.sync_engine, "connect", _register_sqlite_sleep)
+
+
+def build_statement(latency: float):
+    if engine.dialect.name == "postgresql":
+        return text("SELECT pg_sleep(:latency)").bindparams(latency=latency)
+    if latency > 0:
+        return text("SELECT sleep(:latency)").bindparams(latency=latency)
+    return select(func.count(Seat.id))
+
+
+def build_app(latency: float) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/sync")
+    async def sync_route():
+        db = SessionLocal()
+        try:
+            db.execute(build_statement(latency))
+        finally:
+            db.close()
+        return {"ok": True}
+
+    @app.get("/async")
+    async def async_route():
+        async with AsyncSessionLocal() as db:
+            await db.execute(build_statement(latency))
+        return {"ok": True}
+
+    return app
+
+
+async def run(client: httpx.AsyncClient, path: str, requests: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(
+        f"{path:7} {requests / elapsed:9.1f} req/s  "
+        f"p50 {statistics.median(latencies) * 1000:8.2f} ms  "
+        f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:8.2f} ms"
+    )
+
+
+async def main(args):
+    Base.metadata.create_all(bind=engine)
+    app = build_app(args.latency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Warm up both connection pools
+        await client.get("/sync")
+        await client.get("/async")
+        for path in ("/sync", "/async"):
+            await run(client, path, args.requests, args.concurrency)
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.01)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    engine.echo = False
+    async_engine.echo = False
+    asyncio.run(main(args))
@@ -0,0 +1,119 @@
+"""Serialization microbenchmark: response_model validation vs FastJSONResponse.
+
+Serves the same booking and seat list payloads two ways through the ASGI app:
+the previous path (Pydantic models returned and re-validated against
+response_model, then jsonable_encoder + json) and the fast path (plain dicts
+in response-model shape rendered once by orjson). No database is involved.
+
+Run from Backend/app, e.g.:
+    python benchmarks/bench_json_responses.py --requests 300 --seats 100 5000
+
+Needs httpx (requirements-dev.txt).
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import FastAPI
+
+from core.responses import FastJSONResponse
+from schemas.booking import AggregatedBookingDetail, BookingResponse, TicketTypeResponse
+from schemas.seat import SeatResponse
+
+
+def seat_rows(count: int) -> List[dict]:
+    return [{"id": i, "ticket_type_id": i % 5 + 1, "is_available": i % 3 != 0} for i in range(1, count + 1)]
+
+
+def booking_dict(ticket_types: int) -> dict:
+    return {
+        "id": 1,
+        "user_id": 1,
+        "status": "pending",
+        "time": datetime(2024, 1, 1, 12, 0),
+        "booking_details": [
+            {"ticket_type": {"id": i, "name": f"Type {i}", "price": 10.0 * i}, "quantity": i}
+            for i in range(1, ticket_types + 1)
+        ]
+    }
+
+
+def build_app(seats: int, ticket_types: int) -> FastAPI:
+    app = FastAPI()
+    rows = seat_rows(seats)
+    booking = booking_dict(ticket_types)
+
+    @app.get("/model/seats", response_model=List[SeatResponse])
+    async def model_seats():
+        return [SeatResponse(**row) for row in rows]
+
+    @app.get("/fast/seats", response_model=List[SeatResponse])
+    async def fast_seats():
+        return FastJSONResponse(rows)
+
+    @app.get("/model/booking", response_model=BookingResponse)
+    async def model_booking():
+        return BookingResponse(
+            id=booking["id"],
+            user_id=booking["user_id"],
+            status=booking["status"],
+            time=booking["time"],
+            booking_details=[
+                AggregatedBookingDetail(
+                    ticket_type=TicketTypeResponse(**detail["ticket_type"]),
+                    quantity=detail["quantity"]
+                )
+                for detail in booking["booking_details"]
+            ]
+        )
+
+    @app.get("/fast/booking", response_model=BookingResponse)
+    async def fast_booking():
+        return FastJSONResponse(booking)
+
+    return app
+
+
+async def run(client: httpx.AsyncClient, path: str, requests: int) -> float:
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get(path)
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+    return statistics.median(latencies) * 1000
+
+
+async def main(args):
+    print(f"{'payload':16} {'model p50 ms':>13} {'fast p50 ms':>12} {'speedup':>8}")
+    for seats in args.seats:
+        app = build_app(seats, args.ticket_types)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, label in (("booking", f"booking x{args.ticket_types}"), ("seats", f"seats x{seats}")):
+                model_body = (await client.get(f"/model/{name}")).json()
+                fast_body = (await client.get(f"/fast/{name}")).json()
+                assert model_body == fast_body, f"{name} payloads differ"
+                model = await run(client, f"/model/{name}", args.requests)
+                fast = await run(client, f"/fast/{name}", args.requests)
+                print(f"{label:16} {model:13.3f} {fast:12.3f} {model / fast:7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--seats", type=int, nargs="+", default=[100, 5000])
+    parser.add_argument("--ticket-types", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    asyncio.run(main(args))
@@ -0,0 +1,142 @@
+"""Middleware overhead microbenchmark: BaseHTTPMiddleware vs pure ASGI.
+
+Calls a trivial authenticated route through three stacks and reports the
+per-request cost:
+
+  bare      no middleware (the floor)
+  previous  JWTMiddleware on BaseHTTPMiddleware (startswith scan, jwt.decode
+            on every request) plus the @app.middleware("http") request logger
+  current   core.middleware.JWTMiddleware + RequestLoggingMiddleware
+
+Requests are driven straight through the ASGI interface (no HTTP client), so
+the numbers are middleware and framework cost only. Logging is enabled at
+INFO into a null handler so both loggers do their formatting work.
+
+Run from Backend/app, e.g.:
+    python benchmarks/bench_middleware.py --requests 20000
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI, HTTPException, Request
+from jose import JWTError, jwt
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from core.config import settings
+from core.middleware import JWTMiddleware, RequestLoggingMiddleware
+
+EXCLUDED = ["/docs", "/redoc", "/openapi.json", "/auth/login", "/auth/register"]
+
+logger = logging.getLogger("bench_middleware")
+
+
+class PreviousJWTMiddleware(BaseHTTPMiddleware):
+    """The JWT middleware as it was before the pure ASGI rewrite, minus the
+    "/" exclusion that made it skip every path"""
+
+    def __init__(self, app, excluded_paths):
+        super().__init__(app)
+        self.excluded_paths = excluded_paths
+
+    async def dispatch(self, request: Request, call_next):
+        if any(request.url.path.startswith(path) for path in self.excluded_paths):
+            return await call_next(request)
+        auth_header = request.headers.get("Authorization")
+        if not auth_header or not auth_header.startswith("Bearer "):
+            raise HTTPException(status_code=401, detail="Missing or invalid authentication token")
+        try:
+            payload = jwt.decode(auth_header.split(" ")[1], settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except JWTError as e:
+            raise HTTPException(status_code=401, detail=f"Invalid token: {str(e)}")
+        request.state.user = payload.get("sub")
+        request.state.user_data = payload
+        return await call_next(request)
+
+
+def build_app(stack: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    if stack == "previous":
+        app.add_middleware(PreviousJWTMiddleware, excluded_paths=EXCLUDED)
+
+        @app.middleware("http")
+        async def log_requests(request, call_next):
+            logger.info(f"Request: {request.method} {request.url}")
+            logger.info(f"Headers: {request.headers}")
+            response = await call_next(request)
+            logger.info(f"Response headers: {response.headers}")
+            return response
+    elif stack == "current":
+        app.add_middleware(JWTMiddleware, excluded_paths=EXCLUDED)
+        app.add_middleware(RequestLoggingMiddleware)
+    return app
+
+
+async def call(app, token: str) -> int:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/ping", "raw_path": b"/ping", "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"authorization", f"Bearer {token}".encode())],
+        "client": ("127.0.0.1", 1234), "server": ("bench", 80)
+    }
+    status_code = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+
+    await app(scope, receive, send)
+    return status_code
+
+
+async def run(app, token: str, requests: int) -> float:
+    # Warm up (router, caches, lazy imports)
+    for _ in range(200):
+        assert await call(app, token) == 200
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        await call(app, token)
+        latencies.append(time.perf_counter() - started)
+    return statistics.median(latencies) * 1_000_000
+
+
+async def main(args):
+    token = jwt.encode({"sub": "bench@example.com", "exp": int(time.time()) + 3600},
+                       settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    results = {}
+    for stack in ("bare", "previous", "current"):
+        app = build_app(stack)
+        results[stack] = await run(app, token, args.requests)
+
+    print(f"{'stack':10} {'p50 us':>8} {'overhead us':>12}")
+    for stack, p50 in results.items():
+        print(f"{stack:10} {p50:8.1f} {p50 - results['bare']:12.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.NullHandler())
+    root.setLevel(logging.INFO)
+    asyncio.run(main(args))
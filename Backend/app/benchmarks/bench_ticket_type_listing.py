@@ -0,0 +1,114 @@
+"""Ticket type listing benchmark: hydrated seats vs the counter aggregate.
+
+Seeds a scratch database with a growing number of seats and, at each size,
+times the old listing (load `ticket_type.seats` and count in Python) against
+`ticket_type_rows_query()` (one outer join on seat_counters). Peak Python
+memory per call is measured with tracemalloc.
+
+Run from Backend/app, e.g.:
+    python benchmarks/bench_ticket_type_listing.py --seats 1000 10000 50000 --ticket-types 5
+
+Uses a throwaway SQLite file by default; pass --database-url to point it at
+an empty PostgreSQL database instead (its tables are dropped and recreated).
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+
+from database import Base, get_async_database_url
+from api.ticket_type import ticket_type_rows_query, ticket_type_row_to_dict
+from models.seat import Seat
+from models.ticket_type import TicketType
+from services.seat_counters import reconcile_seat_counters
+import models.booking, models.bookingdetail, models.seat_counter, models.user  # noqa: F401
+
+
+async def list_hydrated(db):
+    result = await db.execute(select(TicketType).options(selectinload(TicketType.seats)).order_by(TicketType.id))
+    return [
+        {
+            "id": ticket_type.id,
+            "name": ticket_type.name,
+            "price": ticket_type.price,
+            "available_quantity": sum(1 for seat in ticket_type.seats if seat.is_available)
+        }
+        for ticket_type in result.scalars()
+    ]
+
+
+async def list_aggregate(db):
+    result = await db.execute(ticket_type_rows_query().order_by(TicketType.id))
+    return [ticket_type_row_to_dict(row) for row in result]
+
+
+async def seed(engine, session_factory, seats: int, ticket_types: int):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with session_factory() as db:
+        await db.execute(insert(TicketType), [
+            {"id": i + 1, "name": f"Type {i + 1}", "price": 10.0 * (i + 1)} for i in range(ticket_types)
+        ])
+        # Every third seat is booked so both paths have something to filter
+        await db.execute(insert(Seat), [
+            {"ticket_type_id": i % ticket_types + 1, "is_available": i % 3 != 0} for i in range(seats)
+        ])
+        await reconcile_seat_counters(db)
+        await db.commit()
+
+
+async def measure(session_factory, listing, repeat: int):
+    latencies = []
+    peaks = []
+    rows = None
+    for _ in range(repeat):
+        # Fresh session each time so the identity map starts empty
+        async with session_factory() as db:
+            tracemalloc.start()
+            started = time.perf_counter()
+            rows = await listing(db)
+            latencies.append(time.perf_counter() - started)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+    return rows, statistics.median(latencies), max(peaks)
+
+
+async def main(args):
+    engine = create_async_engine(get_async_database_url(args.database_url))
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    print(f"{'seats':>8}  {'listing':10} {'p50 ms':>9} {'peak KiB':>10}")
+    for seats in args.seats:
+        await seed(engine, session_factory, seats, args.ticket_types)
+        results = {}
+        for name, listing in (("hydrated", list_hydrated), ("aggregate", list_aggregate)):
+            rows, latency, peak = await measure(session_factory, listing, args.repeat)
+            results[name] = rows
+            print(f"{seats:8d}  {name:10} {latency * 1000:9.2f} {peak / 1024:10.1f}")
+        assert results["hydrated"] == results["aggregate"], "listings disagree"
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seats", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--ticket-types", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", default="sqlite:///./bench_ticket_types.db")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    asyncio.run(main(args))
@@ -0,0 +1,109 @@
+# core/admission.py
+from collections import deque
+from typing import Deque
+import asyncio
+
+from fastapi import HTTPException
+from starlette.status import HTTP_503_SERVICE_UNAVAILABLE
+
+from .config import settings
+from .metrics import metrics
+
+class AdmissionRejected(Exception):
+    def __init__(self, queue_position: int):
+        super().__init__(f"Admission rejected at queue position {queue_position}")
+        self.queue_position = queue_position
+
+class AdmissionController:
+    """Caps concurrent work and queues the overflow FIFO with a bounded depth.
+
+    A released slot is handed straight to the oldest waiter so late arrivals
+    cannot overtake the queue. Callers over the queue depth, or still queued
+    after `queue_timeout` seconds, are rejected with their queue position.
+    """
+
+    def __init__(self, name: str, max_in_flight: int, max_queue_depth: int, queue_timeout: float):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_queue_depth = max_queue_depth
+        self.queue_timeout = queue_timeout
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    def _record(self) -> None:
+        metrics.set(f"{self.name}_in_flight", self._in_flight)
+        metrics.set(f"{self.name}_queue_depth", len(self._waiters))
+
+    def _leave_queue(self, waiter: asyncio.Future) -> int:
+        waiter.cancel()
+        position = self._waiters.index(waiter) + 1
+        self._waiters.remove(waiter)
+        self._record()
+        return position
+
+    async def acquire(self) -> None:
+        if self._in_flight < self.max_in_flight and not self._waiters:
+            self._in_flight += 1
+            metrics.inc(f"{self.name}_admitted_total")
+            self._record()
+            return
+
+        if len(self._waiters) >= self.max_queue_depth:
+            metrics.inc(f"{self.name}_rejected_total")
+            raise AdmissionRejected(len(self._waiters) + 1)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._record()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            # A slot handed over right at the deadline is kept
+            if not waiter.done():
+                position = self._leave_queue(waiter)
+                metrics.inc(f"{self.name}_rejected_total")
+                raise AdmissionRejected(position)
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the client went away; pass it on
+                self.release()
+            else:
+                self._leave_queue(waiter)
+            raise
+        metrics.inc(f"{self.name}_admitted_total")
+
+    def release(self) -> None:
+        # Hand the slot to the oldest live waiter, otherwise free it
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self._record()
+                return
+        self._in_flight -= 1
+        self._record()
+
+booking_admission = AdmissionController(
+    "booking_admission",
+    max_in_flight=settings.BOOKING_ADMISSION_MAX_IN_FLIGHT,
+    max_queue_depth=settings.BOOKING_ADMISSION_MAX_QUEUE_DEPTH,
+    queue_timeout=settings.BOOKING_ADMISSION_QUEUE_TIMEOUT_SECONDS
+)
+
+async def admit_booking():
+    """Dependency that holds a booking admission slot for the whole request"""
+    try:
+        await booking_admission.acquire()
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Booking is busy, you are number {e.queue_position} in the queue. Please retry shortly",
+            headers={
+                "Retry-After": str(settings.BOOKING_ADMISSION_RETRY_AFTER_SECONDS),
+                "X-Queue-Position": str(e.queue_position)
+            }
+        )
+    try:
+        yield
+    finally:
+        booking_admission.release()
@@ -0,0 +1,92 @@
+# core/cache.py
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional, Tuple
+import asyncio
+import time
+
+class SnapshotCache:
+    """Holds one computed value for up to `ttl_seconds`.
+
+    Concurrent misses share a single load, and `invalidate()` drops the
+    snapshot so the next read recomputes it.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._value: Any = None
+        self._created_at: Optional[float] = None
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        self._created_at = None
+        self._generation += 1
+
+    def _fresh(self) -> Optional[Tuple[Any, float]]:
+        if self._created_at is None:
+            return None
+        age = time.monotonic() - self._created_at
+        if age >= self.ttl_seconds:
+            return None
+        return self._value, age
+
+    async def get_or_load(self, loader: Callable[[], Awaitable[Any]]) -> Tuple[Any, float]:
+        """Return (value, age in seconds), loading the value if needed"""
+        snapshot = self._fresh()
+        if snapshot is not None:
+            return snapshot
+
+        async with self._lock:
+            snapshot = self._fresh()
+            if snapshot is not None:
+                return snapshot
+
+            generation = self._generation
+            value = await loader()
+            # Do not keep a value that was invalidated while it was loading
+            if generation == self._generation:
+                self._value = value
+                self._created_at = time.monotonic()
+            return value, 0.0
+
+
+class KeyedCache:
+    """LRU of loaded values, each kept for up to `ttl_seconds`.
+
+    `invalidate(*keys)` drops entries after the data behind them changed. A
+    value whose load started before any invalidation is returned but not
+    stored, so a racing write never leaves a stale entry behind. None results
+    (e.g. not found) are not cached.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._generation = 0
+
+    def invalidate(self, *keys: Hashable) -> None:
+        self._generation += 1
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if time.monotonic() < expires_at:
+                self._entries.move_to_end(key)
+                return value
+            del self._entries[key]
+
+        generation = self._generation
+        value = await loader()
+        if value is not None and generation == self._generation:
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
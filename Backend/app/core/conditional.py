@@ -0,0 +1,91 @@
+# core/conditional.py
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from threading import Lock
+from typing import Optional, Tuple
+import time
+import uuid
+
+from fastapi import Request, Response, status
+
+from core.config import settings
+
+
+class ResourceVersion:
+    """In-process version counter driving ETag / Last-Modified validators.
+
+    Writers call `bump()` after their transaction commits. The ETag embeds a
+    per-process id so validators issued by another worker never match here.
+    Writes committed by other processes are not seen, so with `max_age_seconds`
+    set the version also rolls over on that interval, bounding staleness.
+    """
+
+    def __init__(self, name: str, max_age_seconds: float = 0):
+        self.name = name
+        self.max_age_seconds = max_age_seconds
+        self._process_id = uuid.uuid4().hex[:8]
+        self._lock = Lock()
+        self._version = 0
+        self._modified_at = time.time()
+
+    def bump(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._modified_at = time.time()
+
+    def current(self) -> Tuple[str, datetime]:
+        """Return (etag, last modified) for the current version"""
+        now = time.time()
+        with self._lock:
+            version, modified_at = self._version, self._modified_at
+        epoch = 0
+        if self.max_age_seconds > 0:
+            epoch = int(now // self.max_age_seconds)
+            modified_at = max(modified_at, epoch * self.max_age_seconds)
+        etag = f'W/"{self.name}-{self._process_id}-{version}-{epoch}"'
+        # HTTP dates have one second resolution
+        last_modified = datetime.fromtimestamp(int(modified_at), tz=timezone.utc)
+        return etag, last_modified
+
+    def validators(self) -> dict:
+        etag, last_modified = self.current()
+        return {
+            "ETag": etag,
+            "Last-Modified": format_datetime(last_modified, usegmt=True),
+            # Let clients keep the body but revalidate on every use
+            "Cache-Control": "no-cache"
+        }
+
+    def not_modified_response(self, request: Request, response: Response) -> Optional[Response]:
+        """Set the validators on `response` and return a 304 if the request's
+        If-None-Match / If-Modified-Since still match, else None"""
+        headers = self.validators()
+        response.headers.update(headers)
+        if is_not_modified(request, headers["ETag"], headers["Last-Modified"]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return None
+
+
+def _weak(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def is_not_modified(request: Request, etag: str, last_modified: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence and uses weak comparison
+        candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+        return "*" in candidates or _weak(etag) in (_weak(candidate) for candidate in candidates)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+# Ticket types, seats and availability; bumped whenever seat counters,
+# ticket types or bookings change (see services/seat_counters.py)
+catalog_version = ResourceVersion("catalog", settings.CATALOG_VERSION_MAX_AGE_SECONDS)
@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 from pydantic import BaseSettings
 
 class Settings(BaseSettings):
@@ -9,12 +10,91 @@ class Settings(BaseSettings):
     POSTGRES_SERVER: str = os.getenv("POSTGRES_SERVER", "db")
     POSTGRES_PORT: str = os.getenv("POSTGRES_PORT", "5432")
     DATABASE_URL: str = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}:{POSTGRES_PORT}/{POSTGRES_DB}"
+    # Optional read replica for routes using get_replica_db
+    DATABASE_REPLICA_URL: Optional[str] = os.getenv("DATABASE_REPLICA_URL")
+    # Reads by a user who wrote within this window go to the primary
+    REPLICA_READ_AFTER_WRITE_SECONDS: float = 5.0
+    REPLICA_READ_AFTER_WRITE_MAX_ENTRIES: int = 100000
 
     # Security Configuration
     SECRET_KEY: str = os.getenv("SECRET_KEY", "supersecretkey")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7  # 7 days
+    # bcrypt cost factor; stored hashes with another cost are re-hashed on
+    # the next successful login
+    BCRYPT_ROUNDS: int = 12
+    # Threads that run bcrypt off the event loop
+    PASSWORD_HASH_WORKERS: int = 4
+    # Principals (id, type, name) and /auth/me profiles, keyed by the token's uid claim
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    # Token-bucket limits on /auth/login and /auth/register
+    RATE_LIMIT_ENABLED: bool = True
+    AUTH_RATE_LIMIT_IP_CAPACITY: int = 20
+    AUTH_RATE_LIMIT_IP_REFILL_PER_SECOND: float = 0.5  # 30 per minute
+    AUTH_RATE_LIMIT_EMAIL_CAPACITY: int = 5
+    AUTH_RATE_LIMIT_EMAIL_REFILL_PER_SECOND: float = 0.05  # 3 per minute
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    # Shared buckets for multi-worker setups (needs the redis package)
+    RATE_LIMIT_REDIS_URL: Optional[str] = os.getenv("RATE_LIMIT_REDIS_URL")
+    # Only enable behind a proxy that sets X-Forwarded-For
+    RATE_LIMIT_TRUST_FORWARDED_FOR: bool = False
+    # Lifetime of the single-use tickets that open /seats/stream
+    STREAM_TICKET_TTL_SECONDS: int = 30
+    # Verified JWTs kept in memory until their exp (0 disables the cache)
+    VERIFIED_TOKEN_CACHE_MAX_ENTRIES: int = 10000
+
+    # Retry of serialization failures / deadlocks
+    DB_RETRY_MAX_ATTEMPTS: int = 5
+    DB_RETRY_BASE_DELAY_SECONDS: float = 0.01
+    DB_RETRY_MAX_DELAY_SECONDS: float = 0.5
+
+    # Minimum gap between background rebuilds of one ticket type's in-memory
+    # free list after drift from the seats table was detected
+    SEAT_ALLOCATOR_REBUILD_INTERVAL_SECONDS: float = 1.0
+
+    # Booking hold / expiry reaper
+    BOOKING_HOLD_TTL_MINUTES: int = 15  # pending bookings older than this are canceled
+    BOOKING_REAPER_ENABLED: bool = True
+    BOOKING_REAPER_INTERVAL_SECONDS: int = 60
+    BOOKING_REAPER_BATCH_SIZE: int = 500
+
+    # Admission control for POST /bookings/initiate
+    BOOKING_ADMISSION_MAX_IN_FLIGHT: int = 20
+    BOOKING_ADMISSION_MAX_QUEUE_DEPTH: int = 500
+    BOOKING_ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 10.0
+    BOOKING_ADMISSION_RETRY_AFTER_SECONDS: int = 2
+
+    # Idempotency-Key replay cache for booking initiate/confirm/cancel
+    IDEMPOTENCY_TTL_SECONDS: int = 86400  # 24 hours
+    IDEMPOTENCY_MAX_ENTRIES: int = 10000
+
+    # Cached snapshot served by GET /seats/count
+    SEAT_COUNTS_SNAPSHOT_TTL_SECONDS: float = 2.0
+
+    # ETag / Last-Modified on catalog routes; the version also rolls over on
+    # this interval so writes made by other workers show up (0 disables)
+    CATALOG_VERSION_MAX_AGE_SECONDS: float = 30.0
+
+    # Server-Sent Events availability stream
+    AVAILABILITY_STREAM_WINDOW_SECONDS: float = 0.25
+    AVAILABILITY_STREAM_POLL_SECONDS: float = 5.0
+    AVAILABILITY_STREAM_HEARTBEAT_SECONDS: float = 15.0
+    AVAILABILITY_STREAM_HISTORY_SIZE: int = 256
+
+    # Seat listing pagination and NDJSON streaming
+    SEAT_LIST_DEFAULT_LIMIT: int = 500
+    SEAT_LIST_MAX_LIMIT: int = 5000
+    SEAT_STREAM_BATCH_SIZE: int = 1000
+
+    # Admin booking list pagination
+    ADMIN_BOOKING_LIST_DEFAULT_LIMIT: int = 50
+    ADMIN_BOOKING_LIST_MAX_LIMIT: int = 500
+
+    # Admin booking detail cache, invalidated on status changes
+    ADMIN_BOOKING_DETAIL_CACHE_TTL_SECONDS: float = 30.0
+    ADMIN_BOOKING_DETAIL_CACHE_MAX_ENTRIES: int = 5000
 
     # CORS Configuration
     CORS_ORIGINS: list = [
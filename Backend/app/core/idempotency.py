@@ -0,0 +1,155 @@
+# core/idempotency.py
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional, Tuple
+import asyncio
+import hashlib
+import time
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from starlette.status import HTTP_422_UNPROCESSABLE_ENTITY
+
+from .config import settings
+from .metrics import metrics
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+@dataclass
+class IdempotentResult:
+    fingerprint: str
+    expires_at: float
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+    status_code: Optional[int] = None
+    body: Any = None
+    media_type: Optional[str] = None
+
+class IdempotencyStore:
+    """LRU of first responses keyed by (scope, Idempotency-Key).
+
+    The first request with a key runs the handler; repeats of it, including
+    ones arriving while it is still running, get the stored response replayed
+    instead. Successful and 4xx responses are kept for `ttl_seconds`; server
+    errors are forgotten so the client can retry for real, and of the repeats
+    waiting on a failed attempt only one runs again, the rest wait for it.
+    Entries still running are never evicted.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, str], IdempotentResult]" = OrderedDict()
+
+    def _get(self, cache_key: Tuple[str, str]) -> Optional[IdempotentResult]:
+        entry = self._entries.get(cache_key)
+        if entry is None:
+            return None
+        if entry.done.is_set() and entry.expires_at <= time.monotonic():
+            del self._entries[cache_key]
+            return None
+        self._entries.move_to_end(cache_key)
+        return entry
+
+    def _put(self, cache_key: Tuple[str, str], entry: IdempotentResult) -> None:
+        self._entries[cache_key] = entry
+        self._entries.move_to_end(cache_key)
+        excess = len(self._entries) - self.max_entries
+        if excess <= 0:
+            return
+        # In-flight entries are pinned: evicting one would let a repeat run
+        # the handler a second time. Evict the oldest finished ones instead.
+        evicted = []
+        for old_key, old_entry in self._entries.items():
+            if len(evicted) == excess:
+                break
+            if old_entry.done.is_set():
+                evicted.append(old_key)
+        for old_key in evicted:
+            del self._entries[old_key]
+
+    @staticmethod
+    def _replay(entry: IdempotentResult):
+        metrics.inc("idempotency_replays_total")
+        if entry.status_code >= 400:
+            raise HTTPException(
+                status_code=entry.status_code,
+                detail=entry.body,
+                headers={"Idempotent-Replayed": "true"}
+            )
+        if isinstance(entry.body, bytes):
+            # The handler returned an already rendered response
+            return Response(
+                content=entry.body,
+                status_code=entry.status_code,
+                media_type=entry.media_type,
+                headers={"Idempotent-Replayed": "true"}
+            )
+        return JSONResponse(
+            content=entry.body,
+            status_code=entry.status_code,
+            headers={"Idempotent-Replayed": "true"}
+        )
+
+    async def run(
+        self,
+        key: Optional[str],
+        scope: str,
+        handler: Callable[[], Awaitable[Any]],
+        payload: Any = None
+    ):
+        if not key:
+            return await handler()
+
+        cache_key = (scope, key)
+        fingerprint = hashlib.sha256(repr(jsonable_encoder(payload)).encode()).hexdigest()
+
+        # A failed attempt drops its entry before waking its waiters, so the
+        # first waiter to look again finds none and runs the handler; the
+        # others find its new entry and wait on that
+        while True:
+            entry = self._get(cache_key)
+            if entry is None:
+                break
+            if entry.fingerprint != fingerprint:
+                raise HTTPException(
+                    status_code=HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=f"{IDEMPOTENCY_HEADER} was already used with a different request"
+                )
+            await entry.done.wait()
+            if entry.status_code is not None:
+                return self._replay(entry)
+
+        entry = IdempotentResult(
+            fingerprint=fingerprint,
+            expires_at=time.monotonic() + self.ttl_seconds
+        )
+        self._put(cache_key, entry)
+        try:
+            result = await handler()
+        except HTTPException as e:
+            if e.status_code < 500:
+                entry.status_code = e.status_code
+                entry.body = e.detail
+            else:
+                self._entries.pop(cache_key, None)
+            raise
+        except BaseException:
+            self._entries.pop(cache_key, None)
+            raise
+        else:
+            if isinstance(result, Response):
+                entry.status_code = result.status_code
+                entry.body = result.body
+                entry.media_type = result.media_type
+            else:
+                entry.status_code = 200
+                entry.body = jsonable_encoder(result)
+            return result
+        finally:
+            entry.done.set()
+
+idempotency_store = IdempotencyStore(
+    max_entries=settings.IDEMPOTENCY_MAX_ENTRIES,
+    ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS
+)
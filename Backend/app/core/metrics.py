@@ -0,0 +1,31 @@
+# core/metrics.py
+from collections import defaultdict
+from threading import Lock
+from typing import Dict, Union
+
+Number = Union[int, float]
+
+class Metrics:
+    """In-process counters and gauges exposed on GET /metrics"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._counters: Dict[str, Number] = defaultdict(int)
+        self._gauges: Dict[str, Number] = {}
+
+    def inc(self, name: str, value: Number = 1) -> None:
+        with self._lock:
+            self._counters[name] += value
+
+    def set(self, name: str, value: Number) -> None:
+        with self._lock:
+            self._gauges[name] = value
+
+    def snapshot(self) -> Dict[str, Dict[str, Number]]:
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges)
+            }
+
+metrics = Metrics()
@@ -1,11 +1,17 @@
 # core/middleware.py
-from starlette.middleware.base import BaseHTTPMiddleware
-from fastapi import Request, HTTPException
-from jose import JWTError, jwt
+import logging
+import re
+import time
+from typing import Iterable, List, Optional
+
+from fastapi.responses import JSONResponse
+from jose import JWTError
 from starlette.status import HTTP_401_UNAUTHORIZED
-from typing import List, Optional
-from datetime import datetime
-from .config import settings
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .security import decode_token
+
+logger = logging.getLogger(__name__)
 
 EXCLUDED_PATHS = [
     "/auth/login",
@@ -16,44 +22,136 @@ EXCLUDED_PATHS = [
     "/"
 ]
 
-class JWTMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, excluded_paths: Optional[List[str]] = None):
-        super().__init__(app)
-        self.excluded_paths = excluded_paths or EXCLUDED_PATHS
+class PathMatcher:
+    """Precompiled path lookup.
+
+    Every entry matches its exact path; entries other than "/" also match the
+    paths below them ("/docs" matches "/docs/oauth2-redirect" but not
+    "/docsearch"). Exact paths are a set lookup and all prefixes share one
+    compiled regex, so matching does not scan the list per request.
+    """
+
+    def __init__(self, paths: Iterable[str]):
+        paths = list(paths)
+        self._exact = frozenset(paths)
+        prefixes = sorted((path.rstrip("/") for path in paths if path.rstrip("/")), key=len, reverse=True)
+        self._prefix = (
+            re.compile("(?:" + "|".join(re.escape(prefix) for prefix in prefixes) + ")/")
+            if prefixes else None
+        )
+
+    def matches(self, path: str) -> bool:
+        if path in self._exact:
+            return True
+        return self._prefix is not None and self._prefix.match(path) is not None
+
+
+def _bearer_token(scope: Scope) -> Optional[str]:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            value = value.decode("latin-1")
+            if value[:7].lower() == "bearer ":
+                return value[7:].strip() or None
+            return None
+    return None
 
-    async def dispatch(self, request: Request, call_next):
+
+class JWTMiddleware:
+    """Pure ASGI middleware that verifies the bearer token of every request
+    outside `excluded_paths` and stores the payload on `request.state`.
+
+    CORS preflight (OPTIONS) requests are passed through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, excluded_paths: Optional[List[str]] = None):
+        self.app = app
+        self.excluded_paths = PathMatcher(excluded_paths or EXCLUDED_PATHS)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         # Kiểm tra path có trong danh sách excluded không
-        if any(request.url.path.startswith(path) for path in self.excluded_paths):
-            return await call_next(request)
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or self.excluded_paths.matches(scope["path"])
+        ):
+            await self.app(scope, receive, send)
+            return
 
-        auth_header = request.headers.get("Authorization")
-        if not auth_header or not auth_header.startswith("Bearer "):
-            raise HTTPException(
-                status_code=HTTP_401_UNAUTHORIZED,
-                detail="Missing or invalid authentication token"
-            )
+        token = _bearer_token(scope)
+        if not token:
+            await self._unauthorized(scope, receive, send, "Missing or invalid authentication token")
+            return
 
         try:
-            token = auth_header.split(" ")[1]
-            payload = jwt.decode(
-                token, 
-                settings.SECRET_KEY, 
-                algorithms=[settings.ALGORITHM]
-            )
-            
-            # Lưu thông tin user vào request state
-            request.state.user = payload.get("sub")
-            request.state.user_data = payload
-
+            payload = decode_token(token)
         except JWTError as e:
-            raise HTTPException(
-                status_code=HTTP_401_UNAUTHORIZED,
-                detail=f"Invalid token: {str(e)}"
-            )
-        except Exception as e:
-            raise HTTPException(
-                status_code=HTTP_401_UNAUTHORIZED,
-                detail=f"Authentication error: {str(e)}"
-            )
-
-        return await call_next(request)
\ No newline at end of file
+            await self._unauthorized(scope, receive, send, f"Invalid token: {str(e)}")
+            return
+
+        # Lưu thông tin user vào request state; verify_token dùng lại
+        # payload này thay vì decode token lần nữa
+        state = scope.setdefault("state", {})
+        state["user"] = payload.get("sub")
+        state["user_data"] = payload
+        state["token"] = token
+
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    async def _unauthorized(scope: Scope, receive: Receive, send: Send, detail: str) -> None:
+        response = JSONResponse(
+            status_code=HTTP_401_UNAUTHORIZED,
+            content={"detail": detail},
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+        await response(scope, receive, send)
+
+
+class RequestLoggingMiddleware:
+    """Pure ASGI access log: one line per request with status and duration.
+
+    Headers are only logged at DEBUG; Authorization values and token / ticket
+    query parameters are redacted.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not logger.isEnabledFor(logging.INFO):
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug(f"Headers: {_redacted_headers(scope['headers'])}")
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if debug:
+                    logger.debug(f"Response headers: {_redacted_headers(message.get('headers', []))}")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            path = scope["path"]
+            if scope.get("query_string"):
+                query = _SECRET_PARAMS.sub(r"\1=<redacted>", scope["query_string"].decode("latin-1"))
+                path = f"{path}?{query}"
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            logger.info(f"{scope['method']} {path} {status_code} {elapsed_ms:.1f}ms")
+
+
+_SECRET_PARAMS = re.compile(r"\b(access_token|ticket)=[^&]*")
+
+
+def _redacted_headers(headers) -> dict:
+    return {
+        name.decode("latin-1"): "<redacted>" if name == b"authorization" else value.decode("latin-1")
+        for name, value in headers
+    }
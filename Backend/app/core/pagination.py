@@ -0,0 +1,34 @@
+# core/pagination.py
+from datetime import datetime
+from typing import Any, Tuple
+import base64
+import json
+
+# Response header carrying the cursor of the next page; list bodies stay plain arrays
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(sort: str, key: Any, row_id: int) -> str:
+    """Opaque keyset cursor for the row (key, id) under `sort`"""
+    if isinstance(key, datetime):
+        key = key.isoformat()
+    raw = json.dumps({"s": sort, "k": key, "id": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, int]:
+    """Return (key, id) from a cursor produced by `encode_cursor` for `sort`"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if data["s"] != sort:
+            raise InvalidCursor("Cursor was issued for a different sort order")
+        return data["k"], int(data["id"])
+    except InvalidCursor:
+        raise
+    except Exception:
+        raise InvalidCursor("Malformed cursor")
@@ -0,0 +1,190 @@
+# core/rate_limit.py
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional, Tuple
+import logging
+import math
+import time
+
+from fastapi import HTTPException, Request
+from starlette.status import HTTP_429_TOO_MANY_REQUESTS
+
+from .config import settings
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class LocalBucketStore:
+    """Token buckets in process memory, bounded to `max_keys` (LRU).
+
+    Evicting a bucket only forgets its history, so keep `max_keys` well
+    above the number of clients expected within one refill period.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._lock = Lock()
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        """Take one token; return 0 if allowed, else seconds until one is available"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+            retry_after = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                retry_after = (1 - tokens) / refill_per_second
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return retry_after
+
+
+# Same algorithm as LocalBucketStore, atomic in Redis and timed by the Redis
+# clock so every worker shares one bucket per key
+_REDIS_TAKE = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - updated_at) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(retry_after)
+"""
+
+
+class RedisBucketStore:
+    """Token buckets shared by all workers through Redis.
+
+    `redis` is an optional dependency, imported on first use. If Redis is
+    unreachable the limiter falls back to the per-process `fallback` store
+    rather than failing logins.
+    """
+
+    def __init__(self, url: str, fallback: LocalBucketStore, prefix: str = "ratelimit:"):
+        self.url = url
+        self.fallback = fallback
+        self.prefix = prefix
+        self._script = None
+        self._missing_package = False
+
+    def _get_script(self):
+        if self._script is None:
+            import redis.asyncio as redis  # optional dependency, see RATE_LIMIT_REDIS_URL
+
+            client = redis.from_url(self.url)
+            self._script = client.register_script(_REDIS_TAKE)
+        return self._script
+
+    async def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        if self._missing_package:
+            return await self.fallback.take(key, capacity, refill_per_second)
+        try:
+            result = await self._get_script()(keys=[self.prefix + key], args=[capacity, refill_per_second])
+            return float(result)
+        except ImportError:
+            self._missing_package = True
+            logger.error("RATE_LIMIT_REDIS_URL is set but the redis package is not installed; using in-process buckets")
+            return await self.fallback.take(key, capacity, refill_per_second)
+        except Exception as e:
+            metrics.inc("rate_limit_backend_errors_total")
+            logger.warning(f"Rate limit backend unavailable, using in-process buckets: {str(e)}")
+            return await self.fallback.take(key, capacity, refill_per_second)
+
+
+class TokenBucketLimiter:
+    """Allows bursts of `capacity` requests per key, refilled at
+    `refill_per_second` tokens per second"""
+
+    def __init__(self, name: str, capacity: int, refill_per_second: float, store):
+        self.name = name
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.store = store
+
+    async def check(self, key: str) -> None:
+        """Raise a 429 with Retry-After when `key` has no token left"""
+        retry_after = await self.store.take(f"{self.name}:{key}", self.capacity, self.refill_per_second)
+        if retry_after > 0:
+            metrics.inc(f"{self.name}_rejected_total")
+            raise HTTPException(
+                status_code=HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many attempts. Please retry later",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+            )
+
+
+def _create_store():
+    local = LocalBucketStore(settings.RATE_LIMIT_MAX_KEYS)
+    if settings.RATE_LIMIT_REDIS_URL:
+        return RedisBucketStore(settings.RATE_LIMIT_REDIS_URL, fallback=local)
+    return local
+
+
+_store = _create_store()
+
+auth_ip_limiter = TokenBucketLimiter(
+    "auth_ip_rate_limit",
+    capacity=settings.AUTH_RATE_LIMIT_IP_CAPACITY,
+    refill_per_second=settings.AUTH_RATE_LIMIT_IP_REFILL_PER_SECOND,
+    store=_store
+)
+auth_email_limiter = TokenBucketLimiter(
+    "auth_email_rate_limit",
+    capacity=settings.AUTH_RATE_LIMIT_EMAIL_CAPACITY,
+    refill_per_second=settings.AUTH_RATE_LIMIT_EMAIL_REFILL_PER_SECOND,
+    store=_store
+)
+
+
+def client_ip(request: Request) -> str:
+    if settings.RATE_LIMIT_TRUST_FORWARDED_FOR:
+        forwarded_for = request.headers.get("x-forwarded-for")
+        if forwarded_for:
+            # The proxy appends the address it saw; earlier entries are client-supplied
+            return forwarded_for.split(",")[-1].strip()
+    return request.client.host if request.client else "unknown"
+
+
+async def _submitted_email(request: Request) -> Optional[str]:
+    # FastAPI has already read the body for the route, so this reuses it
+    content_type = request.headers.get("content-type", "")
+    try:
+        if content_type.startswith("application/json"):
+            body = await request.json()
+            email = body.get("email") if isinstance(body, dict) else None
+        else:
+            email = (await request.form()).get("username")
+    except Exception:
+        return None
+    return email.strip().lower() if isinstance(email, str) and email.strip() else None
+
+
+def limit_auth_attempts(action: str):
+    """Dependency for login / register: per client IP, then per submitted
+    email, before any database or bcrypt work"""
+
+    async def dependency(request: Request) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        await auth_ip_limiter.check(f"{action}:{client_ip(request)}")
+        email = await _submitted_email(request)
+        if email:
+            await auth_email_limiter.check(f"{action}:{email}")
+
+    return dependency
@@ -0,0 +1,62 @@
+# core/read_routing.py
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional
+import time
+
+from fastapi import Request
+from jose import JWTError, jwt
+
+
+def request_identity(request: Request) -> Optional[str]:
+    """Who is asking, for read-after-write routing only (not authentication).
+
+    Uses the user set by JWTMiddleware when present, otherwise the unverified
+    `sub` claim of the bearer token; routes still authenticate through
+    verify_token.
+    """
+    user = getattr(request.state, "user", None)
+    if user:
+        return str(user)
+
+    token = request.query_params.get("access_token")
+    authorization = request.headers.get("Authorization")
+    if authorization and authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+    if not token:
+        return None
+    try:
+        sub = jwt.get_unverified_claims(token).get("sub")
+    except JWTError:
+        return None
+    return str(sub) if sub else None
+
+
+class ReadAfterWriteGuard:
+    """Remembers who committed a write in the last `window_seconds`, so their
+    reads can skip a replica that may not have replayed the write yet."""
+
+    def __init__(self, window_seconds: float, max_entries: int):
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._lock = Lock()
+        self._writes: "OrderedDict[str, float]" = OrderedDict()
+
+    def record_write(self, identity: str) -> None:
+        with self._lock:
+            self._writes[identity] = time.monotonic()
+            self._writes.move_to_end(identity)
+            while len(self._writes) > self.max_entries:
+                self._writes.popitem(last=False)
+
+    def recently_wrote(self, identity: Optional[str]) -> bool:
+        if identity is None:
+            return False
+        with self._lock:
+            written_at = self._writes.get(identity)
+            if written_at is None:
+                return False
+            if time.monotonic() - written_at >= self.window_seconds:
+                del self._writes[identity]
+                return False
+            return True
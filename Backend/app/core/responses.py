@@ -0,0 +1,33 @@
+# core/responses.py
+from typing import Any
+import json
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize plain dicts / lists (datetimes included) to JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(jsonable_encoder(content), separators=(",", ":")).encode()
+
+
+class FastJSONResponse(Response):
+    """JSON response for content that is already in response-model shape.
+
+    Returning a Response from a route skips FastAPI's response_model
+    validation and jsonable_encoder pass, so routes build plain dicts that
+    match the declared model (still used for the OpenAPI schema) and this
+    serializes them once with orjson.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
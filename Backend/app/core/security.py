@@ -0,0 +1,160 @@
+# core/security.py
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Optional, Tuple
+import asyncio
+import hashlib
+import secrets
+import time
+
+from jose import JWTError, jwt
+from passlib.context import CryptContext
+
+from .config import settings
+
+
+class VerifiedTokenCache:
+    """LRU of JWT payloads whose signature and claims were already checked.
+
+    Keys are SHA-256 digests of the token, so raw tokens are never kept. An
+    entry is dropped once the token's `exp` passes; tokens without `exp` are
+    not cached. Payloads are shared between requests and must not be mutated.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = Lock()
+        self._entries: "OrderedDict[bytes, Tuple[dict, float]]" = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            payload, expires_at = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def put(self, token: str, payload: dict) -> None:
+        if self.max_entries <= 0:
+            return
+        expires_at = payload.get("exp")
+        if not isinstance(expires_at, (int, float)):
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (payload, float(expires_at))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+verified_token_cache = VerifiedTokenCache(settings.VERIFIED_TOKEN_CACHE_MAX_ENTRIES)
+
+
+def decode_token(token: str, scope: Optional[str] = None) -> dict:
+    """Verify `token` and return its payload, raising JWTError if invalid.
+
+    Access tokens carry no `scope` claim; passing `scope` accepts only tokens
+    issued for it (e.g. stream tickets), so neither can stand in for the
+    other. Only the first request with a given token pays for the HMAC check.
+    """
+    payload = verified_token_cache.get(token)
+    if payload is None:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        verified_token_cache.put(token, payload)
+    if payload.get("scope") != scope:
+        raise JWTError("Token is not valid for this endpoint")
+    return payload
+
+
+# Stream tickets. EventSource cannot send an Authorization header, so the
+# SSE stream is opened with a ticket in the URL instead of the access token:
+# a JWT scoped to the stream, valid for STREAM_TICKET_TTL_SECONDS and
+# redeemable once. URLs end up in access logs; a logged ticket is already
+# used and expires within seconds.
+STREAM_TICKET_SCOPE = "seat_stream"
+
+
+class UsedTicketRegistry:
+    """Ids of redeemed tickets, kept until the tickets expire.
+
+    Per process: with several workers a ticket could be redeemed once on
+    each of them within its short lifetime.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._used: "OrderedDict[str, float]" = OrderedDict()
+
+    def claim(self, ticket_id: str, expires_at: float) -> bool:
+        """Mark the ticket used; False if it already was"""
+        now = time.time()
+        with self._lock:
+            # Tickets share one lifetime, so the oldest entries expire first
+            while self._used and next(iter(self._used.values())) <= now:
+                self._used.popitem(last=False)
+            if ticket_id in self._used:
+                return False
+            self._used[ticket_id] = expires_at
+            return True
+
+
+used_stream_tickets = UsedTicketRegistry()
+
+
+def create_stream_ticket(token_data: dict) -> str:
+    """Issue a stream ticket for the caller of a verified access token"""
+    # Only the user id: the ticket ends up in URL logs, the email should not
+    payload = {key: token_data[key] for key in ("uid",) if key in token_data}
+    payload.update({
+        "scope": STREAM_TICKET_SCOPE,
+        "jti": secrets.token_urlsafe(16),
+        "exp": int(time.time()) + settings.STREAM_TICKET_TTL_SECONDS
+    })
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def redeem_stream_ticket(ticket: str) -> dict:
+    """Verify a stream ticket and use it up, raising JWTError if invalid"""
+    payload = decode_token(ticket, scope=STREAM_TICKET_SCOPE)
+    if not used_stream_tickets.claim(payload.get("jti", ""), payload["exp"]):
+        raise JWTError("Stream ticket already used")
+    return payload
+
+
+# Password hashing. A bcrypt call takes tens of milliseconds of CPU, so the
+# async helpers run it on a small dedicated pool instead of the event loop;
+# bcrypt releases the GIL while hashing.
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+password_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+
+
+async def hash_password(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_hash_executor, pwd_context.hash, password)
+
+
+async def verify_and_update_password(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Return (valid, new hash). The new hash is set when the password is
+    valid but `hashed_password` uses another scheme or BCRYPT_ROUNDS changed."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        password_hash_executor, pwd_context.verify_and_update, password, hashed_password
+    )
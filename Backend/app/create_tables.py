@@ -4,6 +4,8 @@ from models.booking import Booking
 from models.seat import Seat
 from models.bookingdetail import BookingDetail
 from models.ticket_type import TicketType
+from models.seat_counter import SeatCounter
+from models.sales_rollup import SalesRollup
 from sqlalchemy import text
 from core.config import settings
 import logging
@@ -1,9 +1,18 @@
-from sqlalchemy import create_engine
+from typing import Awaitable, Callable, Optional, TypeVar
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+import asyncio
 import logging
+import random
 
 from core.config import settings
+from core.metrics import metrics
+from core.read_routing import ReadAfterWriteGuard, request_identity
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -13,7 +22,22 @@ logger = logging.getLogger(__name__)
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 logger.info(f"Database URL: {SQLALCHEMY_DATABASE_URL}")
 
-# Tạo engine
+# Async drivers used by the API for each sync URL scheme
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def get_async_database_url(url: str) -> str:
+    """Map a sync database URL onto its async driver (asyncpg / aiosqlite)"""
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+ASYNC_SQLALCHEMY_DATABASE_URL = get_async_database_url(SQLALCHEMY_DATABASE_URL)
+
+# Tạo engine (sync, dùng cho các script như create_tables.py / create_admin.py)
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     isolation_level="SERIALIZABLE",
@@ -23,18 +47,174 @@ engine = create_engine(
 # Tạo session local
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine và session cho các route của API
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL,
+    isolation_level="SERIALIZABLE",
+    echo=True
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Read replica tùy chọn cho các route chỉ đọc (xem get_replica_db)
+replica_async_engine = None
+if settings.DATABASE_REPLICA_URL:
+    replica_async_engine = create_async_engine(
+        get_async_database_url(settings.DATABASE_REPLICA_URL),
+        echo=True
+    )
+    logger.info("Read replica configured")
+
 # Base class để khai báo model ORM
 Base = declarative_base()
 
+# Isolation levels cho từng route
+SERIALIZABLE = "SERIALIZABLE"
+READ_COMMITTED = "READ COMMITTED"
+
+def bind_with_isolation(isolation_level: str):
+    """Async engine whose connections run at `isolation_level`"""
+    # SQLite only supports SERIALIZABLE, which the engine already uses
+    if async_engine.dialect.name == "sqlite":
+        return async_engine
+    return async_engine.execution_options(isolation_level=isolation_level)
+
+def get_db_with_isolation(isolation_level: str):
+    """Build a get_db dependency whose sessions run at `isolation_level`"""
+    bind = bind_with_isolation(isolation_level)
+
+    async def get_db_at_isolation(request: Request):
+        db = AsyncSessionLocal(bind=bind)
+        if replica_async_engine is not None:
+            # Lets a commit on this session send the caller's next reads to the primary
+            db.info[SESSION_IDENTITY_KEY] = request_identity(request)
+        try:
+            logger.info(f"Database session created ({isolation_level})")
+            yield db
+        except Exception as e:
+            logger.error(f"Database error: {str(e)}")
+            raise
+        finally:
+            await db.close()
+            logger.info("Database session closed")
+
+    return get_db_at_isolation
+
 # Dependency để inject session vào các route
-def get_db():
-    db = SessionLocal()
+get_db = get_db_with_isolation(SERIALIZABLE)
+
+# Dependency cho các route chỉ đọc
+get_read_committed_db = get_db_with_isolation(READ_COMMITTED)
+
+# Session.info keys used for read-after-write routing
+SESSION_IDENTITY_KEY = "request_identity"
+SESSION_WROTE_KEY = "wrote"
+
+read_after_write_guard = ReadAfterWriteGuard(
+    window_seconds=settings.REPLICA_READ_AFTER_WRITE_SECONDS,
+    max_entries=settings.REPLICA_READ_AFTER_WRITE_MAX_ENTRIES
+)
+
+@event.listens_for(Session, "after_flush")
+def _flag_flush_write(session, flush_context):
+    session.info[SESSION_WROTE_KEY] = True
+
+@event.listens_for(Session, "do_orm_execute")
+def _flag_statement_write(orm_execute_state):
+    # Bulk insert / update / delete statements bypass the flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[SESSION_WROTE_KEY] = True
+
+@event.listens_for(Session, "after_commit")
+def _record_committed_write(session):
+    if session.info.pop(SESSION_WROTE_KEY, False):
+        identity = session.info.get(SESSION_IDENTITY_KEY)
+        if identity is not None:
+            read_after_write_guard.record_write(identity)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_rolled_back_write(session, previous_transaction):
+    session.info.pop(SESSION_WROTE_KEY, None)
+
+async def get_replica_db(request: Request):
+    """Read-only session dependency that routes to the read replica.
+
+    Falls back to a READ COMMITTED primary session when no replica is
+    configured, or when the caller committed a write within the last
+    REPLICA_READ_AFTER_WRITE_SECONDS so they always see their own writes.
+
+    Only for responses that are neither cached in process nor validated by
+    an ETag: those are invalidated when the primary commits, and a reload
+    from a replica that has not replayed the commit yet would be kept (or
+    revalidated with 304) as if it were current.
+    """
+    if replica_async_engine is None:
+        bind, target = bind_with_isolation(READ_COMMITTED), "primary"
+    elif read_after_write_guard.recently_wrote(request_identity(request)):
+        bind, target = bind_with_isolation(READ_COMMITTED), "primary"
+        metrics.inc("db_replica_reads_redirected_total")
+    else:
+        bind, target = replica_async_engine, "replica"
+
+    db = AsyncSessionLocal(bind=bind)
     try:
-        logger.info("Database session created")
+        logger.info(f"Database session created (read-only, {target})")
         yield db
     except Exception as e:
         logger.error(f"Database error: {str(e)}")
         raise
     finally:
-        db.close()
-        logger.info("Database session closed")
\ No newline at end of file
+        await db.close()
+        logger.info("Database session closed")
+
+# SQLSTATEs for serialization failure and deadlock
+RETRYABLE_SQLSTATES = {"40001", "40P01"}
+
+def is_retryable_error(error: DBAPIError) -> bool:
+    orig = error.orig
+    sqlstate = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+    if sqlstate in RETRYABLE_SQLSTATES:
+        return True
+    # SQLite reports write contention as "database is locked"
+    return "database is locked" in str(orig)
+
+T = TypeVar("T")
+
+async def run_in_transaction(
+    db: AsyncSession,
+    work: Callable[[], Awaitable[T]],
+    name: str = "transaction",
+    max_attempts: Optional[int] = None
+) -> T:
+    """Run `work` (which must commit its own transaction), retrying on
+    serialization failures and deadlocks with jittered exponential backoff.
+    Any other error is re-raised after rolling back."""
+    max_attempts = max_attempts or settings.DB_RETRY_MAX_ATTEMPTS
+    attempt = 1
+    while True:
+        try:
+            return await work()
+        except DBAPIError as e:
+            await db.rollback()
+            if not is_retryable_error(e):
+                raise
+            if attempt >= max_attempts:
+                metrics.inc(f'db_transaction_retries_exhausted_total{{route="{name}"}}')
+                logger.error(f"{name} gave up after {attempt} attempts: {str(e.orig)}")
+                raise
+            metrics.inc(f'db_transaction_retries_total{{route="{name}"}}')
+            delay = min(
+                settings.DB_RETRY_MAX_DELAY_SECONDS,
+                settings.DB_RETRY_BASE_DELAY_SECONDS * 2 ** attempt
+            )
+            logger.warning(f"{name} hit a serialization conflict, retry {attempt}/{max_attempts - 1}")
+            await asyncio.sleep(random.uniform(0, delay))
+            attempt += 1
+        except Exception:
+            await db.rollback()
+            raise
\ No newline at end of file
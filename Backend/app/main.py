@@ -1,22 +1,25 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.security import OAuth2PasswordBearer
 from fastapi.middleware.cors import CORSMiddleware
-from api import auth, seat, ticket_type, booking
-from database import engine, Base
-from core.middleware import JWTMiddleware
+from api import auth, seat, ticket_type, booking, report
+from database import async_engine, replica_async_engine, Base, AsyncSessionLocal
+from core.middleware import JWTMiddleware, RequestLoggingMiddleware
+from core.metrics import metrics
+import asyncio
 import logging
 from core.config import settings
 from database import get_db
 from models.user import User
 from schemas.user import UserCreate, UserResponse, Token, TokenData
+from services.availability import availability_broadcaster
+from services.reaper import run_booking_reaper
+from services.seat_allocator import seat_allocator
+from services.seat_counters import create_missing_seat_counters
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
 # Configure OAuth2
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
@@ -33,17 +36,58 @@ app = FastAPI(
     }
 )
 
-# Thêm CORS middleware với cấu hình cho phép tất cả
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-    expose_headers=["*"]
-)
+# Create database tables
+@app.on_event("startup")
+async def create_tables():
+    async with async_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+# Load the in-memory seat allocator before serving bookings
+@app.on_event("startup")
+async def load_seat_allocator():
+    async with AsyncSessionLocal() as db:
+        await seat_allocator.load(db)
+
+# Seed availability counters for ticket types that predate them
+@app.on_event("startup")
+async def seed_seat_counters():
+    async with AsyncSessionLocal() as db:
+        created = await create_missing_seat_counters(db)
+        await db.commit()
+    if created:
+        logger.info(f"Seeded seat counters for {created} ticket types")
+
+# Cancel pending bookings whose hold has expired
+@app.on_event("startup")
+async def start_booking_reaper():
+    app.state.booking_reaper = None
+    if settings.BOOKING_REAPER_ENABLED:
+        app.state.booking_reaper = asyncio.create_task(run_booking_reaper())
+
+@app.on_event("shutdown")
+async def stop_booking_reaper():
+    if app.state.booking_reaper:
+        app.state.booking_reaper.cancel()
+
+# Push availability changes to /seats/stream subscribers
+@app.on_event("startup")
+async def start_availability_broadcaster():
+    app.state.availability_broadcaster = asyncio.create_task(availability_broadcaster.run())
 
-# Add JWT Middleware with excluded paths
+@app.on_event("shutdown")
+async def stop_availability_broadcaster():
+    availability_broadcaster.close()
+    app.state.availability_broadcaster.cancel()
+
+@app.on_event("shutdown")
+async def dispose_engine():
+    await async_engine.dispose()
+    if replica_async_engine is not None:
+        await replica_async_engine.dispose()
+
+# Add JWT Middleware with excluded paths; "/" only matches the root, the
+# other entries also cover the paths below them. /seats/stream is checked by
+# its route with a single-use ticket (EventSource cannot send headers).
 app.add_middleware(
     JWTMiddleware,
     excluded_paths=[
@@ -52,18 +96,25 @@ app.add_middleware(
         "/openapi.json",
         "/auth/login",
         "/auth/register",
+        "/seats/stream",
         "/"
     ]
 )
 
+# Middleware added later wraps the earlier ones: CORS sits outside JWT so
+# 401 responses still carry CORS headers
+# Thêm CORS middleware với cấu hình cho phép tất cả
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=settings.CORS_ORIGINS,
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+    expose_headers=["*"]
+)
+
 # Thêm middleware để log requests
-@app.middleware("http")
-async def log_requests(request, call_next):
-    logger.info(f"Request: {request.method} {request.url}")
-    logger.info(f"Headers: {request.headers}")
-    response = await call_next(request)
-    logger.info(f"Response headers: {response.headers}")
-    return response
+app.add_middleware(RequestLoggingMiddleware)
 
 # Include routers with proper prefixes and tags
 app.include_router(
@@ -100,6 +151,13 @@ app.include_router(
     responses={404: {"description": "Not found"}}
 )
 
+app.include_router(
+    report.router,
+    prefix="/reports",
+    tags=["Reports"],
+    responses={401: {"description": "Unauthorized"}, 403: {"description": "Forbidden"}}
+)
+
 @app.get("/")
 async def root():
     return {
@@ -108,6 +166,11 @@ async def root():
         "redoc": "/redoc"
     }
 
+# Request counts and latencies are internal: admins only
+@app.get("/metrics", dependencies=[Depends(auth.require_admin)])
+async def get_metrics():
+    return metrics.snapshot()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
@@ -1,13 +1,22 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float, Index
 from sqlalchemy.orm import relationship
 from database import Base
 
 class Booking(Base):
     __tablename__ = "bookings"
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     status = Column(String, nullable=False)
     time = Column(DateTime, nullable=False)
+    # Sum of the ticket prices at booking time, kept so the admin list can sort by it
+    total_amount = Column(Float, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        # Keyset pagination of the admin booking list
+        Index("ix_bookings_time_id", "time", "id"),
+        Index("ix_bookings_total_amount_id", "total_amount", "id"),
+        Index("ix_bookings_status_time_id", "status", "time", "id"),
+    )
 
     user = relationship("User")
     booking_details = relationship("BookingDetail", back_populates="booking", cascade="all, delete-orphan")
\ No newline at end of file
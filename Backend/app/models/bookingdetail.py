@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint
+from sqlalchemy import Boolean, Column, Float, Integer, ForeignKey, Index, text, true
 from sqlalchemy.orm import relationship
 from database import Base
 
@@ -8,14 +8,31 @@ class BookingDetail(Base):
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
 
-    booking_id = Column(Integer, ForeignKey("bookings.id"), nullable=False)
+    booking_id = Column(Integer, ForeignKey("bookings.id"), nullable=False, index=True)
     seat_id = Column(Integer, ForeignKey("seats.id"), nullable=False)
     ticket_type_id = Column(Integer, ForeignKey("ticket_types.id"), nullable=False)
+    # Ticket price at booking time; later price changes do not rewrite history.
+    # create_all does not add columns to existing tables; on an existing
+    # database add and backfill it, then run rebuild_sales_rollups.py:
+    #   ALTER TABLE booking_details ADD COLUMN price FLOAT;
+    #   UPDATE booking_details SET price = ticket_types.price
+    #     FROM ticket_types WHERE ticket_types.id = booking_details.ticket_type_id;
+    #   ALTER TABLE booking_details ALTER COLUMN price SET NOT NULL;
+    price = Column(Float, nullable=False)
+    # False once the seat has been released by a cancel or expiry
+    is_active = Column(Boolean, nullable=False, default=True, server_default=true())
 
     __table_args__ = (
-        UniqueConstraint('seat_id', name='uix_seat_booking'),
+        # A seat can only be held by one active booking; released rows are kept as history
+        Index(
+            'uix_seat_booking',
+            'seat_id',
+            unique=True,
+            postgresql_where=text('is_active'),
+            sqlite_where=text('is_active')
+        ),
     )
 
     booking = relationship("Booking", back_populates="booking_details")
     seat = relationship("Seat", back_populates="booking_details")
-    ticket_type = relationship("TicketType", back_populates="booking_details")
\ No newline at end of file
+    ticket_type = relationship("TicketType", back_populates="booking_details")
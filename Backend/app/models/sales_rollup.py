@@ -0,0 +1,11 @@
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer
+from database import Base
+
+class SalesRollup(Base):
+    """Paid sales per ticket type per hour of booking time, kept in step with
+    booking status changes (see services/sales_rollup.py)"""
+    __tablename__ = "sales_rollups"
+    bucket_start = Column(DateTime, primary_key=True)
+    ticket_type_id = Column(Integer, ForeignKey("ticket_types.id"), primary_key=True)
+    tickets_sold = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from database import Base
 
@@ -9,4 +9,9 @@ class Seat(Base):
     is_available = Column(Boolean, default=True)
 
     ticket_type = relationship("TicketType")
-    booking_details = relationship("BookingDetail", back_populates="seat", cascade="all, delete-orphan")
\ No newline at end of file
+    booking_details = relationship("BookingDetail", back_populates="seat", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Keyset pagination of the seat listing filtered by ticket type
+        Index("ix_seats_ticket_type_id_id", "ticket_type_id", "id"),
+    )
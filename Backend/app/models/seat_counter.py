@@ -0,0 +1,9 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from database import Base
+
+class SeatCounter(Base):
+    """Total and available seats per ticket type, kept in step with `seats`"""
+    __tablename__ = "seat_counters"
+    ticket_type_id = Column(Integer, ForeignKey("ticket_types.id"), primary_key=True)
+    total_seats = Column(Integer, nullable=False, default=0)
+    available_seats = Column(Integer, nullable=False, default=0)
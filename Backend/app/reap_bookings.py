@@ -0,0 +1,34 @@
+from database import AsyncSessionLocal, async_engine
+from models.user import User
+from models.booking import Booking
+from models.seat import Seat
+from models.bookingdetail import BookingDetail
+from models.ticket_type import TicketType
+from models.seat_counter import SeatCounter
+from models.sales_rollup import SalesRollup
+from services.reaper import reap_expired_bookings, run_booking_reaper
+import argparse
+import asyncio
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+async def reap_once():
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await reap_expired_bookings(db)
+        logger.info(
+            f"Reaper run finished: {result['bookings_expired']} bookings expired, "
+            f"{result['seats_reclaimed']} seats reclaimed"
+        )
+    finally:
+        await async_engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cancel expired pending bookings and release their seats")
+    parser.add_argument("--loop", action="store_true", help="keep running at BOOKING_REAPER_INTERVAL_SECONDS")
+    args = parser.parse_args()
+
+    asyncio.run(run_booking_reaper() if args.loop else reap_once())
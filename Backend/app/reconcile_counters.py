@@ -0,0 +1,27 @@
+from database import AsyncSessionLocal, async_engine
+from models.user import User
+from models.booking import Booking
+from models.seat import Seat
+from models.bookingdetail import BookingDetail
+from models.ticket_type import TicketType
+from models.seat_counter import SeatCounter
+from models.sales_rollup import SalesRollup
+from services.seat_counters import reconcile_seat_counters
+import asyncio
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+async def reconcile_counters():
+    try:
+        async with AsyncSessionLocal() as db:
+            count = await reconcile_seat_counters(db)
+            await db.commit()
+        logger.info(f"Recomputed seat counters for {count} ticket types")
+    finally:
+        await async_engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(reconcile_counters())
@@ -1,7 +1,19 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, root_validator, validator
 from typing import Optional, List
 from datetime import datetime
 
+# Bookings are stored as pending / paid / canceled; the admin dashboard
+# sends CONFIRMED / CANCELLED
+BOOKING_STATUSES = ("pending", "paid", "canceled")
+BOOKING_STATUS_ALIASES = {
+    "confirmed": "paid",
+    "cancelled": "canceled",
+}
+
+def normalize_booking_status(status: str) -> str:
+    status = status.strip().lower()
+    return BOOKING_STATUS_ALIASES.get(status, status)
+
 class BookingBase(BaseModel):
     """Base schema for booking data"""
     user_id: int
@@ -67,6 +79,49 @@ class AdminBookingDetail(BaseModel):
     class Config:
         from_attributes = True
 
+class BulkBookingStatusUpdate(BaseModel):
+    """Schema for updating the status of many bookings at once (admin only)"""
+    status: str = Field(..., description="Target status for the selected bookings")
+    booking_ids: Optional[List[int]] = Field(None, description="Bookings to update")
+    current_status: Optional[str] = Field(None, description="Only update bookings currently in this status")
+    created_from: Optional[datetime] = Field(None, description="Only update bookings created at or after this time")
+    created_to: Optional[datetime] = Field(None, description="Only update bookings created before this time")
+    limit: int = Field(1000, gt=0, le=5000, description="Maximum number of bookings handled per request")
+
+    @validator('status', 'current_status')
+    def validate_status(cls, v):
+        if v is None:
+            return v
+        status = normalize_booking_status(v)
+        if status not in BOOKING_STATUSES:
+            raise ValueError(f"Status must be one of: {', '.join(BOOKING_STATUSES)}")
+        return status
+
+    @root_validator
+    def require_ids_or_filter(cls, values):
+        if values.get("booking_ids") is None and not any(
+            values.get(key) for key in ("current_status", "created_from", "created_to")
+        ):
+            raise ValueError("Provide booking_ids or at least one filter")
+        # Ids past the limit would be silently skipped; make the caller split them
+        booking_ids, limit = values.get("booking_ids"), values.get("limit")
+        if booking_ids is not None and limit is not None and len(set(booking_ids)) > limit:
+            raise ValueError(f"At most {limit} booking_ids per request; raise limit or split the request")
+        return values
+
+class BulkBookingStatusResult(BaseModel):
+    """Outcome of a bulk status update for one booking"""
+    id: int
+    status: Optional[str] = None
+    updated: bool
+    message: str
+
+class BulkBookingStatusResponse(BaseModel):
+    """Schema for bulk booking status update response"""
+    updated: int
+    has_more: bool = False
+    results: List[BulkBookingStatusResult] = []
+
 # Request schemas
 class SeatRequest(BaseModel):
     """Schema for individual seat request"""
@@ -75,7 +130,7 @@ class SeatRequest(BaseModel):
 
 class BookingInitiateRequest(BaseModel):
     """Schema for booking initiation request"""
-    user_id: int = Field(..., description="ID of the user making the booking")
+    user_id: Optional[int] = Field(None, description="Ignored; the booking belongs to the authenticated user")
     seats_requested: List[SeatRequest] = Field(..., description="List of seat requests")
 
 # Error response schema
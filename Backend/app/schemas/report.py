@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+class SalesReportRow(BaseModel):
+    """Paid sales of one ticket type, optionally within one time bucket"""
+    bucket_start: Optional[datetime] = Field(None, description="Start of the hour/day bucket; omitted for totals")
+    ticket_type_id: int
+    ticket_type_name: str
+    tickets_sold: int
+    revenue: float
+
+class SalesReportResponse(BaseModel):
+    """Schema for the sales report over a booking time range"""
+    date_from: datetime
+    date_to: datetime
+    granularity: str
+    tickets_sold: int
+    revenue: float
+    rows: List[SalesReportRow] = []
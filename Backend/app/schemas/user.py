@@ -51,6 +51,10 @@ class Token(BaseModel):
             }
         }
 
+class StreamTicket(BaseModel):
+    ticket: str
+    expires_in: int
+
 class TokenData(BaseModel):
     email: Optional[str] = None
     type: Optional[str] = None 
\ No newline at end of file
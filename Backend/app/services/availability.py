@@ -0,0 +1,160 @@
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, Optional, Tuple
+import asyncio
+import json
+import logging
+
+from sqlalchemy import func, select
+
+from core.config import settings
+from core.metrics import metrics
+from database import AsyncSessionLocal, READ_COMMITTED, bind_with_isolation
+from models.seat_counter import SeatCounter
+from models.ticket_type import TicketType
+from services.seat_counters import on_seat_counters_committed
+
+logger = logging.getLogger(__name__)
+
+
+def format_event(event: str, data: dict, event_id: Optional[int] = None) -> str:
+    """Encode one Server-Sent Events frame"""
+    frame = f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+    if event_id is not None:
+        frame = f"id: {event_id}\n" + frame
+    return frame
+
+
+class AvailabilityBroadcaster:
+    """Pushes per ticket type availability to Server-Sent Events subscribers.
+
+    Commits that change the seat counters only mark the broadcaster dirty. A
+    single background task waits out a short coalescing window, reads every
+    counter in one query and encodes one frame with the changed ticket types,
+    which all subscribers share. The counters are also re-read every poll
+    interval so changes committed by other workers reach these clients too.
+    Subscribers that fall behind the frame history get a fresh snapshot.
+    """
+
+    def __init__(self, window_seconds: float, poll_interval_seconds: float, history_size: int):
+        self.window_seconds = window_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self._available: Optional[Dict[int, int]] = None
+        self._seq = 0
+        self._history: Deque[Tuple[int, str]] = deque(maxlen=history_size)
+        self._dirty = asyncio.Event()
+        self._published = asyncio.Event()
+        self._subscribers = 0
+        self._closed = False
+
+    @property
+    def subscribers(self) -> int:
+        return self._subscribers
+
+    def notify(self, changes: Dict[int, int]) -> None:
+        """Seat counter commit listener; the next refresh happens within one window"""
+        self._dirty.set()
+
+    async def _read_counters(self) -> Dict[int, int]:
+        async with AsyncSessionLocal(bind=bind_with_isolation(READ_COMMITTED)) as db:
+            result = await db.execute(
+                select(TicketType.id, func.coalesce(SeatCounter.available_seats, 0))
+                .outerjoin(SeatCounter, SeatCounter.ticket_type_id == TicketType.id)
+            )
+            return {ticket_type_id: available for ticket_type_id, available in result}
+
+    async def refresh(self) -> None:
+        """Re-read the counters and publish a frame if anything changed"""
+        available = await self._read_counters()
+        previous = self._available
+        self._available = available
+        if previous is None:
+            return
+
+        changed = {
+            ticket_type_id: count for ticket_type_id, count in available.items()
+            if previous.get(ticket_type_id) != count
+        }
+        removed = [ticket_type_id for ticket_type_id in previous if ticket_type_id not in available]
+        if not changed and not removed:
+            return
+
+        self._seq += 1
+        frame = format_event("availability", {
+            "available": changed,
+            "deltas": {
+                ticket_type_id: count - previous.get(ticket_type_id, 0)
+                for ticket_type_id, count in changed.items()
+            },
+            "removed": removed
+        }, event_id=self._seq)
+        self._history.append((self._seq, frame))
+        metrics.inc("availability_stream_frames_total")
+
+        # Wake every subscriber waiting on the old event at once
+        published, self._published = self._published, asyncio.Event()
+        published.set()
+
+    def snapshot_frame(self) -> str:
+        return format_event("snapshot", {"available": self._available or {}}, event_id=self._seq)
+
+    async def run(self) -> None:
+        """Background loop started by main.py"""
+        while not self._closed:
+            try:
+                try:
+                    await asyncio.wait_for(self._dirty.wait(), timeout=self.poll_interval_seconds)
+                    # Coalesce everything committed during the window into one frame
+                    await asyncio.sleep(self.window_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                self._dirty.clear()
+                if self._subscribers:
+                    await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Availability refresh failed: {str(e)}")
+
+    async def subscribe(self, heartbeat_seconds: float) -> AsyncIterator[str]:
+        """Yield a snapshot, then availability frames and keepalive comments"""
+        self._subscribers += 1
+        metrics.set("availability_stream_subscribers", self._subscribers)
+        try:
+            # Nothing refreshes the counters while nobody is subscribed
+            if self._available is None or self._subscribers == 1:
+                self._available = await self._read_counters()
+            seq = self._seq
+            yield self.snapshot_frame()
+
+            while not self._closed:
+                published = self._published
+                if self._seq > seq:
+                    if self._history and self._history[0][0] > seq + 1:
+                        # Fell behind the history; start over from a snapshot
+                        seq = self._seq
+                        yield self.snapshot_frame()
+                    else:
+                        frames = [frame for frame_seq, frame in self._history if frame_seq > seq]
+                        seq = self._seq
+                        yield "".join(frames)
+                    continue
+                try:
+                    await asyncio.wait_for(published.wait(), timeout=heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+        finally:
+            self._subscribers -= 1
+            metrics.set("availability_stream_subscribers", self._subscribers)
+
+    def close(self) -> None:
+        """End every open stream, e.g. on shutdown"""
+        self._closed = True
+        self._published.set()
+
+
+availability_broadcaster = AvailabilityBroadcaster(
+    window_seconds=settings.AVAILABILITY_STREAM_WINDOW_SECONDS,
+    poll_interval_seconds=settings.AVAILABILITY_STREAM_POLL_SECONDS,
+    history_size=settings.AVAILABILITY_STREAM_HISTORY_SIZE
+)
+on_seat_counters_committed(availability_broadcaster.notify)
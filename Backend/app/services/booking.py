@@ -0,0 +1,174 @@
+from typing import Dict, Iterable, List
+import logging
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.cache import KeyedCache
+from core.config import settings
+from models.bookingdetail import BookingDetail
+from models.seat import Seat
+from models.ticket_type import TicketType
+from services.seat_allocator import seat_allocator
+from services.seat_counters import adjust_seat_counters
+
+logger = logging.getLogger(__name__)
+
+# Rendered GET /bookings/admin/{id} bodies; every status change must
+# invalidate the booking after its commit
+admin_booking_detail_cache = KeyedCache(
+    max_entries=settings.ADMIN_BOOKING_DETAIL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.ADMIN_BOOKING_DETAIL_CACHE_TTL_SECONDS
+)
+
+
+async def get_ticket_types_by_id(db: AsyncSession, ticket_type_ids: Iterable[int]) -> Dict[int, TicketType]:
+    """Load the requested ticket types in a single query, keyed by id."""
+    result = await db.execute(select(TicketType).where(TicketType.id.in_(list(ticket_type_ids))))
+    ticket_types = result.scalars().all()
+    return {ticket_type.id: ticket_type for ticket_type in ticket_types}
+
+
+async def claim_seats(db: AsyncSession, ticket_type_id: int, quantity: int) -> List[int]:
+    """Mark up to `quantity` free seats of a ticket type as taken and return their ids.
+
+    Rows already locked by a concurrent buyer are skipped instead of waited on,
+    so parallel bookings claim disjoint seats in one statement. Fewer ids than
+    requested means the ticket type is sold out; the caller must roll back.
+    """
+    candidates = (
+        select(Seat.id)
+        .where(
+            Seat.ticket_type_id == ticket_type_id,
+            Seat.is_available == True
+        )
+        .order_by(Seat.id)
+        .limit(quantity)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        update(Seat)
+        .where(Seat.id.in_(candidates), Seat.is_available == True)
+        .values(is_available=False)
+        .returning(Seat.id)
+        .execution_options(synchronize_session=False)
+    )
+    return [row.id for row in result]
+
+
+async def claim_seat_ids(db: AsyncSession, seat_ids: List[int]) -> List[int]:
+    """Write an in-memory allocation through to `seats`.
+
+    Only ids that are still free and not locked by another transaction are
+    claimed; the returned list is the subset that was actually taken.
+    """
+    if not seat_ids:
+        return []
+    candidates = (
+        select(Seat.id)
+        .where(Seat.id.in_(seat_ids), Seat.is_available == True)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        update(Seat)
+        .where(Seat.id.in_(candidates), Seat.is_available == True)
+        .values(is_available=False)
+        .returning(Seat.id)
+        .execution_options(synchronize_session=False)
+    )
+    return [row.id for row in result]
+
+
+async def allocate_seats(db: AsyncSession, ticket_type_id: int, quantity: int) -> List[int]:
+    """Claim seats from the in-memory allocator, falling back to the database.
+
+    Any shortfall is claimed with `claim_seats`; if the allocator turns out to
+    disagree with the table, that ticket type is rebuilt in the background.
+    """
+    seat_ids = seat_allocator.allocate(ticket_type_id, quantity)
+    # Allocator ids still in flight; if a statement fails the transaction is
+    # rolled back (and possibly retried), so they go back to the free list
+    in_flight = seat_ids
+    try:
+        claimed = await claim_seat_ids(db, seat_ids)
+
+        if len(claimed) < quantity:
+            seat_allocator.settle(set(seat_ids) - set(claimed))
+            in_flight = list(claimed)
+            fallback = await claim_seats(db, ticket_type_id, quantity - len(claimed))
+            if fallback or len(claimed) < len(seat_ids):
+                logger.warning(f"Seat allocator drifted for ticket type {ticket_type_id}, scheduling rebuild")
+                seat_allocator.mark_stale(ticket_type_id)
+            seat_allocator.discard(fallback)
+            claimed.extend(fallback)
+    except BaseException:
+        seat_allocator.release(ticket_type_id, in_flight)
+        raise
+
+    return claimed
+
+
+async def insert_booking_details(
+    db: AsyncSession,
+    booking_id: int,
+    claimed_seats: Dict[int, List[int]],
+    prices: Dict[int, float]
+) -> None:
+    """Insert one BookingDetail per claimed seat with a single bulk statement,
+    recording the ticket type price from `prices` at booking time."""
+    rows = [
+        {
+            "booking_id": booking_id,
+            "seat_id": seat_id,
+            "ticket_type_id": ticket_type_id,
+            "price": prices[ticket_type_id]
+        }
+        for ticket_type_id, seat_ids in claimed_seats.items()
+        for seat_id in seat_ids
+    ]
+    if rows:
+        await db.execute(insert(BookingDetail), rows)
+
+
+async def release_booking_seats(db: AsyncSession, booking_ids: List[int]) -> Dict[int, List[int]]:
+    """Release every seat still held by the given bookings.
+
+    Runs a fixed number of set-based statements whatever the number of seats:
+    the held seats are flipped back to available, the availability counters
+    are credited and the booking details are marked as released so the seats
+    can be booked again. Shared by cancel, the admin
+    status updates and the expiry reaper. Returns the released seat ids grouped
+    by ticket type so the caller can hand them back to the allocator after
+    commit.
+    """
+    if not booking_ids:
+        return {}
+    held_seats = (
+        select(BookingDetail.seat_id)
+        .where(BookingDetail.booking_id.in_(booking_ids), BookingDetail.is_active == True)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        update(Seat)
+        # Seats already freed (e.g. by PUT /seats/{id}) were credited then
+        .where(Seat.id.in_(held_seats), Seat.is_available == False)
+        .values(is_available=True)
+        .returning(Seat.id, Seat.ticket_type_id)
+        .execution_options(synchronize_session=False)
+    )
+    released_seats: Dict[int, List[int]] = {}
+    for seat_id, ticket_type_id in result:
+        released_seats.setdefault(ticket_type_id, []).append(seat_id)
+    await adjust_seat_counters(db, {
+        ticket_type_id: len(seat_ids) for ticket_type_id, seat_ids in released_seats.items()
+    })
+
+    await db.execute(
+        update(BookingDetail)
+        .where(BookingDetail.booking_id.in_(booking_ids), BookingDetail.is_active == True)
+        .values(is_active=False)
+        .execution_options(synchronize_session=False)
+    )
+    return released_seats
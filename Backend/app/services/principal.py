@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+from typing import Optional
+import logging
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from core.cache import KeyedCache
+from core.config import settings
+from models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Session.info key collecting the ids of users changed in the current transaction
+CHANGED_USERS_KEY = "changed_user_ids"
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated caller, as resolved from the access token"""
+    id: int
+    email: str
+    type: str
+    name: str
+
+
+principal_cache = KeyedCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+# Profile fields served by /auth/me; invalidated together with the principal
+profile_cache = KeyedCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+
+def _principal_query():
+    return select(User.id, User.email, User.type, User.name)
+
+
+async def load_principal(db: AsyncSession, user_id: int) -> Optional[Principal]:
+    row = (await db.execute(_principal_query().where(User.id == user_id))).first()
+    return Principal(*row) if row else None
+
+
+async def resolve_principal(db: AsyncSession, token_data: dict) -> Optional[Principal]:
+    """Return the caller of a verified token, or None if the user is gone.
+
+    Tokens carry the user id as `uid`; those are served from the cache.
+    Tokens issued before `uid` existed are looked up by email, uncached,
+    until they expire.
+    """
+    user_id = token_data.get("uid")
+    if isinstance(user_id, int):
+        principal = await principal_cache.get_or_load(user_id, lambda: load_principal(db, user_id))
+        # sub is still the email; a mismatch means the id was reused
+        if principal is not None and principal.email != token_data.get("sub"):
+            return None
+        return principal
+
+    row = (await db.execute(_principal_query().where(User.email == token_data.get("sub")))).first()
+    return Principal(*row) if row else None
+
+
+async def load_profile(db: AsyncSession, user_id: int) -> Optional[dict]:
+    row = (await db.execute(select(
+        User.id, User.name, User.email, User.date_of_birth, User.phone_number, User.type
+    ).where(User.id == user_id))).first()
+    return dict(row._mapping) if row else None
+
+
+async def get_profile(db: AsyncSession, user_id: int) -> Optional[dict]:
+    """The user's profile for /auth/me, served from the cache"""
+    return await profile_cache.get_or_load(user_id, lambda: load_profile(db, user_id))
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _track_changed_user(mapper, connection, target: User) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(CHANGED_USERS_KEY, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    user_ids = session.info.pop(CHANGED_USERS_KEY, None)
+    if user_ids:
+        principal_cache.invalidate(*user_ids)
+        profile_cache.invalidate(*user_ids)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back_users(session: Session, previous_transaction) -> None:
+    session.info.pop(CHANGED_USERS_KEY, None)
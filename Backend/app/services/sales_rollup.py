@@ -0,0 +1,86 @@
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.booking import Booking
+from models.bookingdetail import BookingDetail
+from models.sales_rollup import SalesRollup
+
+UPSERT_INSERTS = {
+    "postgresql": postgresql_insert,
+    "sqlite": sqlite_insert,
+}
+
+# Rows are bucketed by hour of booking time, so a booking always lands in
+# the same bucket and a later cancel can subtract exactly what it added
+def bucket_start(time: datetime) -> datetime:
+    return time.replace(minute=0, second=0, microsecond=0)
+
+
+def sales_sign(old_status: str, new_status: str) -> int:
+    """+1 when a booking becomes paid, -1 when it stops being paid, else 0"""
+    return int(new_status == "paid") - int(old_status == "paid")
+
+
+def _accumulate(totals: Dict[Tuple[datetime, int], List], row: Tuple[datetime, int, int, float], sign: int) -> None:
+    time, ticket_type_id, tickets, revenue = row
+    total = totals.setdefault((bucket_start(time), ticket_type_id), [0, 0.0])
+    total[0] += sign * tickets
+    total[1] += sign * float(revenue or 0)
+
+
+def _rollup_rows(totals: Dict[Tuple[datetime, int], List]) -> List[dict]:
+    return [
+        {"bucket_start": bucket, "ticket_type_id": ticket_type_id, "tickets_sold": tickets, "revenue": revenue}
+        for (bucket, ticket_type_id), (tickets, revenue) in totals.items()
+    ]
+
+
+def _sales_query():
+    return (
+        select(Booking.time, BookingDetail.ticket_type_id, func.count(BookingDetail.id), func.sum(BookingDetail.price))
+        .join(BookingDetail, BookingDetail.booking_id == Booking.id)
+        .group_by(Booking.time, BookingDetail.ticket_type_id)
+    )
+
+
+async def apply_sales_rollup(db: AsyncSession, booking_ids: List[int], sign: int) -> None:
+    """Add (sign=1) or subtract (sign=-1) the tickets and revenue of the given
+    bookings to their rollup rows with one upsert. The caller commits, so the
+    rollup changes in the same transaction as the booking status."""
+    if not booking_ids or not sign:
+        return
+    result = await db.execute(_sales_query().where(Booking.id.in_(booking_ids)))
+    totals: Dict[Tuple[datetime, int], List] = {}
+    for row in result:
+        _accumulate(totals, row, sign)
+    rows = _rollup_rows(totals)
+    if not rows:
+        return
+
+    statement = UPSERT_INSERTS[db.get_bind().dialect.name](SalesRollup).values(rows)
+    await db.execute(statement.on_conflict_do_update(
+        index_elements=[SalesRollup.bucket_start, SalesRollup.ticket_type_id],
+        set_={
+            "tickets_sold": SalesRollup.tickets_sold + statement.excluded.tickets_sold,
+            "revenue": SalesRollup.revenue + statement.excluded.revenue
+        }
+    ))
+
+
+async def rebuild_sales_rollups(db: AsyncSession) -> int:
+    """Recompute every rollup row from paid bookings, e.g. after a migration
+    or to repair drift. The caller commits; returns the number of rows written."""
+    await db.execute(delete(SalesRollup))
+    result = await db.stream(_sales_query().where(Booking.status == "paid"))
+    totals: Dict[Tuple[datetime, int], List] = {}
+    async for row in result:
+        _accumulate(totals, row, 1)
+    rows = _rollup_rows(totals)
+    if rows:
+        await db.execute(SalesRollup.__table__.insert(), rows)
+    return len(rows)
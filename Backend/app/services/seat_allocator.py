@@ -0,0 +1,162 @@
+from collections import deque
+from threading import Lock
+from typing import Deque, Dict, Iterable, List, Set
+import asyncio
+import logging
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.metrics import metrics
+from database import AsyncSessionLocal, READ_COMMITTED, bind_with_isolation
+from models.seat import Seat
+
+logger = logging.getLogger(__name__)
+
+
+class SeatAllocator:
+    """Per-process free list of available seats, one per ticket type.
+
+    Seats are handed out from memory in O(1) and the caller writes the claim
+    through to the `seats` table. Ids handed out but not yet committed are kept
+    "in flight" so a reload does not offer them again. When a write-through
+    finds a seat that is no longer free in the database, only that ticket
+    type's free list is rebuilt, in the background on its own session. One
+    rebuild per ticket type runs at a time and at most once per
+    `rebuild_interval_seconds`; until then the database fallback in
+    `allocate_seats` absorbs the drift, so a burst of mismatches (e.g. several
+    workers selling the same ticket type) does not turn into a burst of scans.
+    """
+
+    def __init__(self, rebuild_interval_seconds: float):
+        self.rebuild_interval_seconds = rebuild_interval_seconds
+        self._lock = Lock()
+        # Each free list may hold stale ids; the sets are the source of truth
+        self._free_lists: Dict[int, Deque[int]] = {}
+        self._free_sets: Dict[int, Set[int]] = {}
+        self._in_flight: Set[int] = set()
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self._rebuilds: Dict[int, asyncio.Task] = {}
+        self._rebuilt_at: Dict[int, float] = {}
+
+    async def load(self, db: AsyncSession) -> None:
+        """Rebuild the free lists from the available rows in `seats`."""
+        result = await db.execute(
+            select(Seat.id, Seat.ticket_type_id)
+            .where(Seat.is_available == True)
+            .order_by(Seat.id)
+        )
+        rows = result.all()
+
+        with self._lock:
+            self._free_lists = {}
+            self._free_sets = {}
+            for seat_id, ticket_type_id in rows:
+                if seat_id in self._in_flight:
+                    continue
+                self._free_lists.setdefault(ticket_type_id, deque()).append(seat_id)
+                self._free_sets.setdefault(ticket_type_id, set()).add(seat_id)
+            self._loaded = True
+
+        logger.info(f"Seat allocator loaded {len(rows)} available seats")
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        """Load on first use; concurrent first callers share one load."""
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if not self._loaded:
+                await self.load(db)
+
+    def mark_stale(self, ticket_type_id: int) -> None:
+        """Schedule a rebuild of one ticket type's free list."""
+        if ticket_type_id in self._rebuilds:
+            return
+        next_allowed = self._rebuilt_at.get(ticket_type_id, float("-inf")) + self.rebuild_interval_seconds
+        delay = max(0.0, next_allowed - time.monotonic())
+        self._rebuilds[ticket_type_id] = asyncio.get_running_loop().create_task(
+            self._rebuild(ticket_type_id, delay)
+        )
+
+    async def _rebuild(self, ticket_type_id: int, delay: float) -> None:
+        try:
+            if delay:
+                await asyncio.sleep(delay)
+            async with AsyncSessionLocal(bind=bind_with_isolation(READ_COMMITTED)) as db:
+                result = await db.execute(
+                    select(Seat.id)
+                    .where(Seat.ticket_type_id == ticket_type_id, Seat.is_available == True)
+                    .order_by(Seat.id)
+                )
+                seat_ids = result.scalars().all()
+
+            with self._lock:
+                free = [seat_id for seat_id in seat_ids if seat_id not in self._in_flight]
+                self._free_lists[ticket_type_id] = deque(free)
+                self._free_sets[ticket_type_id] = set(free)
+            metrics.inc("seat_allocator_rebuilds_total")
+            logger.info(f"Seat allocator rebuilt ticket type {ticket_type_id}: {len(free)} available seats")
+        except Exception as e:
+            logger.error(f"Seat allocator rebuild of ticket type {ticket_type_id} failed: {str(e)}")
+        finally:
+            self._rebuilt_at[ticket_type_id] = time.monotonic()
+            self._rebuilds.pop(ticket_type_id, None)
+
+    def allocate(self, ticket_type_id: int, quantity: int) -> List[int]:
+        """Hand out up to `quantity` free seat ids of a ticket type."""
+        seat_ids: List[int] = []
+        with self._lock:
+            free_list = self._free_lists.get(ticket_type_id)
+            free_set = self._free_sets.get(ticket_type_id)
+            while free_list and len(seat_ids) < quantity:
+                seat_id = free_list.popleft()
+                if seat_id in free_set:
+                    free_set.discard(seat_id)
+                    self._in_flight.add(seat_id)
+                    seat_ids.append(seat_id)
+        return seat_ids
+
+    def settle(self, seat_ids: Iterable[int]) -> None:
+        """Forget seats whose claim has been committed."""
+        with self._lock:
+            self._in_flight.difference_update(seat_ids)
+
+    def release(self, ticket_type_id: int, seat_ids: Iterable[int]) -> None:
+        """Return seats to the free list of a ticket type."""
+        with self._lock:
+            free_list = self._free_lists.setdefault(ticket_type_id, deque())
+            free_set = self._free_sets.setdefault(ticket_type_id, set())
+            for seat_id in seat_ids:
+                self._in_flight.discard(seat_id)
+                if seat_id not in free_set:
+                    free_set.add(seat_id)
+                    free_list.append(seat_id)
+
+    def release_seats(self, seats_by_ticket_type: Dict[int, List[int]]) -> None:
+        for ticket_type_id, seat_ids in seats_by_ticket_type.items():
+            self.release(ticket_type_id, seat_ids)
+
+    def discard(self, seat_ids: Iterable[int]) -> None:
+        """Remove seats that were taken or deleted outside the allocator."""
+        with self._lock:
+            for seat_id in seat_ids:
+                self._in_flight.discard(seat_id)
+                for free_set in self._free_sets.values():
+                    free_set.discard(seat_id)
+
+    def drop_ticket_type(self, ticket_type_id: int) -> None:
+        with self._lock:
+            self._free_lists.pop(ticket_type_id, None)
+            self._free_sets.pop(ticket_type_id, None)
+
+    def available(self, ticket_type_id: int) -> int:
+        with self._lock:
+            return len(self._free_sets.get(ticket_type_id, ()))
+
+
+seat_allocator = SeatAllocator(
+    rebuild_interval_seconds=settings.SEAT_ALLOCATOR_REBUILD_INTERVAL_SECONDS
+)
@@ -0,0 +1,151 @@
+from typing import Callable, Dict, List, Optional
+import logging
+
+from sqlalchemy import case, delete, event, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from core.conditional import catalog_version
+from models.seat import Seat
+from models.seat_counter import SeatCounter
+from models.ticket_type import TicketType
+
+logger = logging.getLogger(__name__)
+
+# Session.info key collecting the counter changes of the current transaction
+PENDING_CHANGES_KEY = "seat_counter_changes"
+
+# Callbacks run after a transaction that changed the counters commits
+_commit_listeners: List[Callable[[Dict[int, int]], None]] = []
+
+
+def on_seat_counters_committed(callback: Callable[[Dict[int, int]], None]) -> None:
+    """Register `callback(available_deltas)` to run after counter changes commit.
+
+    The deltas map ticket type ids to the net change in available seats; a
+    ticket type created, deleted or renamed shows up with a delta of 0.
+    """
+    _commit_listeners.append(callback)
+
+
+def mark_seat_counters_changed(db: AsyncSession, available_deltas: Dict[int, int]) -> None:
+    pending = db.info.setdefault(PENDING_CHANGES_KEY, {})
+    for ticket_type_id, delta in available_deltas.items():
+        pending[ticket_type_id] = pending.get(ticket_type_id, 0) + delta
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed_changes(session: Session) -> None:
+    changes = session.info.pop(PENDING_CHANGES_KEY, None)
+    if changes is None:
+        return
+    for callback in _commit_listeners:
+        try:
+            callback(changes)
+        except Exception as e:
+            logger.error(f"Seat counter listener failed: {str(e)}")
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back_changes(session: Session, previous_transaction) -> None:
+    session.info.pop(PENDING_CHANGES_KEY, None)
+
+
+# Counter changes cover every ticket type, seat and booking write, so they
+# drive the ETag of the catalog routes
+on_seat_counters_committed(lambda changes: catalog_version.bump())
+
+
+async def adjust_seat_counters(
+    db: AsyncSession,
+    available_deltas: Dict[int, int],
+    total_deltas: Optional[Dict[int, int]] = None
+) -> None:
+    """Apply per-ticket-type deltas to the counters in one statement.
+
+    Must run in the same transaction as the seat change it accounts for.
+    """
+    total_deltas = total_deltas or {}
+    ticket_type_ids = {
+        ticket_type_id
+        for ticket_type_id, delta in list(available_deltas.items()) + list(total_deltas.items())
+        if delta
+    }
+    if not ticket_type_ids:
+        return
+    mark_seat_counters_changed(db, {
+        ticket_type_id: available_deltas.get(ticket_type_id, 0) for ticket_type_id in ticket_type_ids
+    })
+
+    def delta_for(deltas: Dict[int, int]):
+        changed = {ticket_type_id: delta for ticket_type_id, delta in deltas.items() if delta}
+        if not changed:
+            return 0
+        return case(changed, value=SeatCounter.ticket_type_id, else_=0)
+
+    await db.execute(
+        update(SeatCounter)
+        .where(SeatCounter.ticket_type_id.in_(ticket_type_ids))
+        .values(
+            available_seats=SeatCounter.available_seats + delta_for(available_deltas),
+            total_seats=SeatCounter.total_seats + delta_for(total_deltas)
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def create_seat_counter(db: AsyncSession, ticket_type_id: int) -> None:
+    db.add(SeatCounter(ticket_type_id=ticket_type_id, total_seats=0, available_seats=0))
+    mark_seat_counters_changed(db, {ticket_type_id: 0})
+
+
+async def delete_seat_counter(db: AsyncSession, ticket_type_id: int) -> None:
+    await db.execute(delete(SeatCounter).where(SeatCounter.ticket_type_id == ticket_type_id))
+    mark_seat_counters_changed(db, {ticket_type_id: 0})
+
+
+def seat_counts_query():
+    """Total and available seats per ticket type, counted from `seats`"""
+    return (
+        select(
+            TicketType.id,
+            func.count(Seat.id),
+            func.coalesce(func.sum(case((Seat.is_available == True, 1), else_=0)), 0)
+        )
+        .select_from(TicketType)
+        .outerjoin(Seat, Seat.ticket_type_id == TicketType.id)
+        .group_by(TicketType.id)
+    )
+
+
+async def reconcile_seat_counters(db: AsyncSession) -> int:
+    """Recompute every counter from `seats`, repairing any drift.
+
+    The caller commits; returns the number of counters written.
+    """
+    await db.execute(delete(SeatCounter))
+    mark_seat_counters_changed(db, {})
+    result = await db.execute(
+        insert(SeatCounter).from_select(
+            ["ticket_type_id", "total_seats", "available_seats"],
+            seat_counts_query()
+        )
+    )
+    return result.rowcount
+
+
+async def create_missing_seat_counters(db: AsyncSession) -> int:
+    """Add counters for ticket types that have none yet, e.g. after upgrading.
+
+    The caller commits; returns the number of counters created.
+    """
+    missing = seat_counts_query().where(
+        ~TicketType.id.in_(select(SeatCounter.ticket_type_id))
+    )
+    result = await db.execute(
+        insert(SeatCounter).from_select(
+            ["ticket_type_id", "total_seats", "available_seats"],
+            missing
+        )
+    )
+    return result.rowcount
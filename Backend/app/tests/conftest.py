@@ -0,0 +1,77 @@
+import asyncio
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Modules import each other from the app root (core., services., models.)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Tests create and drop tables, so never let them near a configured database
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="booking-tests-"), "test.db")
+os.environ.pop("DATABASE_REPLICA_URL", None)
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["BOOKING_REAPER_ENABLED"] = "false"
+
+
+@pytest.fixture
+def database():
+    """Empty tables for one test; yields a runner for coroutines that use
+    the async engine, which is disposed on the runner's own event loop"""
+    import create_tables  # noqa: F401  registers every model on Base
+    from database import Base, async_engine, engine
+
+    def run(coroutine):
+        async def run_and_dispose():
+            try:
+                return await coroutine
+            finally:
+                await async_engine.dispose()
+
+        return asyncio.run(run_and_dispose())
+
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield run
+    finally:
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def client(database):
+    """TestClient for the app on empty tables, with per-process caches cleared"""
+    from fastapi.testclient import TestClient
+
+    from api.seat import seat_counts_snapshot
+    from main import app
+    from services.booking import admin_booking_detail_cache
+    from services.principal import principal_cache, profile_cache
+
+    # Ids restart with every test database
+    for cache in (principal_cache, profile_cache, admin_booking_detail_cache):
+        cache.clear()
+    seat_counts_snapshot.invalidate()
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def login(client):
+    """Register a user of the given type and return its Authorization header"""
+
+    def register_and_login(email: str, type: str = "user") -> dict:
+        client.post("/auth/register", json={
+            "name": "Test User",
+            "email": email,
+            "date_of_birth": "1990-01-01",
+            "phone_number": "0123456789",
+            "type": type,
+            "password": "secret1"
+        })
+        response = client.post("/auth/login", data={"username": email, "password": "secret1"})
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    return register_and_login
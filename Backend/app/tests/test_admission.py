@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from core.admission import AdmissionController, AdmissionRejected
+
+
+def controller(max_in_flight=1, max_queue_depth=2, queue_timeout=1.0):
+    return AdmissionController("test_admission", max_in_flight, max_queue_depth, queue_timeout)
+
+
+def test_admits_up_to_max_in_flight():
+    async def scenario():
+        admission = controller(max_in_flight=2)
+        await admission.acquire()
+        await admission.acquire()
+        assert admission._in_flight == 2
+        admission.release()
+        admission.release()
+        assert admission._in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_released_slot_goes_to_oldest_waiter():
+    async def scenario():
+        admission = controller(max_in_flight=1)
+        await admission.acquire()
+        order = []
+
+        async def wait(name):
+            await admission.acquire()
+            order.append(name)
+
+        first = asyncio.create_task(wait("first"))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(wait("second"))
+        await asyncio.sleep(0)
+
+        admission.release()
+        await first
+        assert order == ["first"]
+        admission.release()
+        await second
+        assert order == ["first", "second"]
+        assert admission._in_flight == 1
+
+    asyncio.run(scenario())
+
+
+def test_rejects_when_queue_is_full():
+    async def scenario():
+        admission = controller(max_in_flight=1, max_queue_depth=1)
+        await admission.acquire()
+        queued = asyncio.create_task(admission.acquire())
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            await admission.acquire()
+        assert rejected.value.queue_position == 2
+
+        admission.release()
+        await queued
+
+    asyncio.run(scenario())
+
+
+def test_rejects_after_queue_timeout_and_leaves_queue():
+    async def scenario():
+        admission = controller(max_in_flight=1, queue_timeout=0.01)
+        await admission.acquire()
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            await admission.acquire()
+        assert rejected.value.queue_position == 1
+        assert not admission._waiters
+
+    asyncio.run(scenario())
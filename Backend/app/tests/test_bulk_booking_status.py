@@ -0,0 +1,58 @@
+import pytest
+from pydantic import ValidationError
+
+from schemas.booking import BulkBookingStatusUpdate
+
+
+def test_status_is_normalized():
+    update = BulkBookingStatusUpdate(status=" CONFIRMED ", current_status="Pending", booking_ids=[1])
+    assert update.status == "paid"
+    assert update.current_status == "pending"
+
+
+@pytest.mark.parametrize("status", ["", "   ", "payed"])
+def test_unknown_or_blank_status_is_rejected(status):
+    with pytest.raises(ValidationError):
+        BulkBookingStatusUpdate(status=status, booking_ids=[1])
+    with pytest.raises(ValidationError):
+        BulkBookingStatusUpdate(status="paid", current_status=status)
+
+
+def test_more_ids_than_limit_is_rejected():
+    with pytest.raises(ValidationError):
+        BulkBookingStatusUpdate(status="paid", booking_ids=[1, 2, 3], limit=2)
+
+
+def test_bulk_update_is_admin_only(client, login):
+    response = client.post(
+        "/bookings/admin/status/bulk",
+        json={"status": "canceled", "current_status": "pending"},
+        headers=login("user@example.com")
+    )
+    assert response.status_code == 403
+
+
+def test_bulk_update_reports_each_requested_id(client, login):
+    admin = login("admin@example.com", type="admin")
+    ticket_type = client.post("/ticket-types/", json={"name": "Standard", "price": 10}, headers=admin).json()
+    client.post("/seats/bulk", json={"ticket_type_id": ticket_type["id"], "quantity": 3}, headers=admin)
+    for _ in range(2):
+        client.post(
+            "/bookings/initiate",
+            json={"seats_requested": [{"ticket_type_id": ticket_type["id"], "quantity": 1}]},
+            headers=admin
+        )
+    client.post("/bookings/admin/status/bulk", json={"status": "paid", "booking_ids": [2]}, headers=admin)
+
+    response = client.post(
+        "/bookings/admin/status/bulk",
+        json={"status": "canceled", "current_status": "pending", "booking_ids": [1, 2, 999]},
+        headers=admin
+    )
+    assert response.status_code == 200
+    messages = {result["id"]: result["message"] for result in response.json()["results"]}
+    assert messages == {
+        1: "Booking status updated successfully",
+        2: "Booking does not match the filter",
+        999: "Booking not found"
+    }
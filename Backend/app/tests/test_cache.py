@@ -0,0 +1,107 @@
+import asyncio
+
+from core.cache import KeyedCache, SnapshotCache
+
+
+def counting_loader(value="value", delay=0.0):
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return value
+
+    return loader, calls
+
+
+def test_snapshot_concurrent_misses_share_one_load():
+    async def scenario():
+        cache = SnapshotCache(ttl_seconds=60)
+        loader, calls = counting_loader(delay=0.01)
+        results = await asyncio.gather(*[cache.get_or_load(loader) for _ in range(5)])
+
+        assert len(calls) == 1
+        assert [value for value, _ in results] == ["value"] * 5
+
+    asyncio.run(scenario())
+
+
+def test_snapshot_invalidate_forces_reload():
+    async def scenario():
+        cache = SnapshotCache(ttl_seconds=60)
+        loader, calls = counting_loader()
+        await cache.get_or_load(loader)
+        await cache.get_or_load(loader)
+        cache.invalidate()
+        await cache.get_or_load(loader)
+
+        assert len(calls) == 2
+
+    asyncio.run(scenario())
+
+
+def test_snapshot_invalidated_during_load_is_not_kept():
+    async def scenario():
+        cache = SnapshotCache(ttl_seconds=60)
+
+        async def loader():
+            cache.invalidate()
+            return "stale"
+
+        assert await cache.get_or_load(loader) == ("stale", 0.0)
+        assert cache._fresh() is None
+
+    asyncio.run(scenario())
+
+
+def test_keyed_cache_serves_loaded_values_until_invalidated():
+    async def scenario():
+        cache = KeyedCache(max_entries=10, ttl_seconds=60)
+        loader, calls = counting_loader()
+        await cache.get_or_load(1, loader)
+        await cache.get_or_load(1, loader)
+        assert len(calls) == 1
+
+        cache.invalidate(1)
+        await cache.get_or_load(1, loader)
+        assert len(calls) == 2
+
+    asyncio.run(scenario())
+
+
+def test_keyed_cache_does_not_keep_none():
+    async def scenario():
+        cache = KeyedCache(max_entries=10, ttl_seconds=60)
+        loader, calls = counting_loader(value=None)
+        await cache.get_or_load(1, loader)
+        await cache.get_or_load(1, loader)
+
+        assert len(calls) == 2
+
+    asyncio.run(scenario())
+
+
+def test_keyed_cache_is_bounded_lru():
+    async def scenario():
+        cache = KeyedCache(max_entries=2, ttl_seconds=60)
+        loader, _ = counting_loader()
+        for key in (1, 2, 1, 3):
+            await cache.get_or_load(key, loader)
+
+        assert list(cache._entries) == [1, 3]
+
+    asyncio.run(scenario())
+
+
+def test_keyed_cache_drops_value_invalidated_while_loading():
+    async def scenario():
+        cache = KeyedCache(max_entries=10, ttl_seconds=60)
+
+        async def loader():
+            cache.invalidate(1)
+            return "stale"
+
+        assert await cache.get_or_load(1, loader) == "stale"
+        assert 1 not in cache._entries
+
+    asyncio.run(scenario())
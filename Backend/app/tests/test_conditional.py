@@ -0,0 +1,72 @@
+from fastapi import Request, Response
+
+from core.conditional import ResourceVersion, is_not_modified
+
+
+def request_with(**headers):
+    return Request({
+        "type": "http",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    })
+
+
+def test_bump_changes_the_etag():
+    version = ResourceVersion("test")
+    etag, _ = version.current()
+    version.bump()
+
+    assert version.current()[0] != etag
+    assert ResourceVersion("test").current()[0] != etag
+
+
+def test_if_none_match_uses_weak_comparison():
+    etag = 'W/"test-1"'
+
+    assert is_not_modified(request_with(if_none_match='W/"test-1"'), etag, "")
+    assert is_not_modified(request_with(if_none_match='"test-1"'), etag, "")
+    assert is_not_modified(request_with(if_none_match='"other", W/"test-1"'), etag, "")
+    assert is_not_modified(request_with(if_none_match="*"), etag, "")
+    assert not is_not_modified(request_with(if_none_match='W/"test-2"'), etag, "")
+    assert not is_not_modified(request_with(), etag, "")
+
+
+def test_if_modified_since():
+    last_modified = "Wed, 01 May 2024 12:00:00 GMT"
+
+    assert is_not_modified(request_with(if_modified_since=last_modified), 'W/"x"', last_modified)
+    assert not is_not_modified(
+        request_with(if_modified_since="Wed, 01 May 2024 11:59:59 GMT"), 'W/"x"', last_modified
+    )
+    assert not is_not_modified(request_with(if_modified_since="yesterday"), 'W/"x"', last_modified)
+    # If-None-Match wins over If-Modified-Since
+    assert not is_not_modified(
+        request_with(if_none_match='W/"y"', if_modified_since=last_modified), 'W/"x"', last_modified
+    )
+
+
+def test_not_modified_response_sets_validators():
+    version = ResourceVersion("test")
+    response = Response()
+    assert version.not_modified_response(request_with(), response) is None
+    assert response.headers["ETag"] == version.current()[0]
+
+    not_modified = version.not_modified_response(request_with(if_none_match=response.headers["ETag"]), Response())
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == response.headers["ETag"]
+
+
+def test_ticket_type_list_answers_304_until_the_catalog_changes(client, login):
+    admin = login("admin@example.com", type="admin")
+    client.post("/ticket-types/", json={"name": "Standard", "price": 10}, headers=admin)
+
+    first = client.get("/ticket-types/", headers=admin)
+    etag = first.headers["ETag"]
+    repeat = client.get("/ticket-types/", headers={**admin, "If-None-Match": etag})
+    assert repeat.status_code == 304
+    assert repeat.content == b""
+
+    client.post("/ticket-types/", json={"name": "VIP", "price": 20}, headers=admin)
+    changed = client.get("/ticket-types/", headers={**admin, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert len(changed.json()) == 2
@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from core.idempotency import IdempotencyStore
+
+
+def counting_handler(result=None, error=None, delay=0.0):
+    calls = []
+
+    async def handler():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return result if result is not None else {"call": len(calls)}
+
+    return handler, calls
+
+
+def test_without_key_always_runs():
+    async def scenario():
+        store = IdempotencyStore(max_entries=10, ttl_seconds=60)
+        handler, calls = counting_handler()
+        await store.run(None, "scope", handler)
+        await store.run(None, "scope", handler)
+        assert len(calls) == 2
+
+    asyncio.run(scenario())
+
+
+def test_repeat_replays_first_response():
+    async def scenario():
+        store = IdempotencyStore(max_entries=10, ttl_seconds=60)
+        handler, calls = counting_handler()
+        first = await store.run("key", "scope", handler, {"a": 1})
+        replay = await store.run("key", "scope", handler, {"a": 1})
+
+        assert first == {"call": 1}
+        assert len(calls) == 1
+        assert replay.headers["Idempotent-Replayed"] == "true"
+        assert replay.body == b'{"call":1}'
+
+    asyncio.run(scenario())
+
+
+def test_key_reused_with_other_payload_is_rejected():
+    async def scenario():
+        store = IdempotencyStore(max_entries=10, ttl_seconds=60)
+        handler, _ = counting_handler()
+        await store.run("key", "scope", handler, {"a": 1})
+        with pytest.raises(HTTPException) as rejected:
+            await store.run("key", "scope", handler, {"a": 2})
+        assert rejected.value.status_code == 422
+
+    asyncio.run(scenario())
+
+
+def test_client_errors_are_replayed():
+    async def scenario():
+        store = IdempotencyStore(max_entries=10, ttl_seconds=60)
+        handler, calls = counting_handler(error=HTTPException(status_code=409, detail="Sold out"))
+        for _ in range(2):
+            with pytest.raises(HTTPException) as raised:
+                await store.run("key", "scope", handler)
+            assert raised.value.status_code == 409
+            assert raised.value.detail == "Sold out"
+        assert len(calls) == 1
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_repeats_of_failed_request_rerun_once():
+    async def scenario():
+        store = IdempotencyStore(max_entries=10, ttl_seconds=60)
+        calls = []
+
+        async def handler():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            if len(calls) == 1:
+                raise HTTPException(status_code=503, detail="Unavailable")
+            return {"call": len(calls)}
+
+        results = await asyncio.gather(
+            *[store.run("key", "scope", handler) for _ in range(4)],
+            return_exceptions=True
+        )
+
+        assert len(calls) == 2
+        assert results[0].status_code == 503
+        assert results[1] == {"call": 2}
+        assert all(result.status_code == 200 for result in results[2:])
+
+    asyncio.run(scenario())
+
+
+def test_in_flight_entries_are_not_evicted():
+    async def scenario():
+        store = IdempotencyStore(max_entries=1, ttl_seconds=60)
+        slow, slow_calls = counting_handler(delay=0.01)
+        fast, _ = counting_handler()
+
+        first = asyncio.create_task(store.run("slow", "scope", slow))
+        await asyncio.sleep(0)
+        await store.run("fast", "scope", fast)
+        repeat = asyncio.create_task(store.run("slow", "scope", slow))
+        await asyncio.gather(first, repeat)
+
+        assert len(slow_calls) == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,10 @@
+def test_metrics_require_a_token(client):
+    assert client.get("/metrics").status_code == 401
+
+
+def test_metrics_are_admin_only(client, login):
+    assert client.get("/metrics", headers=login("user@example.com")).status_code == 403
+
+    response = client.get("/metrics", headers=login("admin@example.com", type="admin"))
+    assert response.status_code == 200
+    assert isinstance(response.json(), dict)
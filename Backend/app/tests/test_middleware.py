@@ -0,0 +1,98 @@
+import logging
+import time
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from core.config import settings
+from core.middleware import JWTMiddleware, PathMatcher, RequestLoggingMiddleware
+
+
+def test_path_matcher_matches_exact_paths_and_paths_below_them():
+    matcher = PathMatcher(["/docs", "/auth/login", "/"])
+
+    assert matcher.matches("/docs")
+    assert matcher.matches("/docs/oauth2-redirect")
+    assert matcher.matches("/auth/login")
+    assert matcher.matches("/")
+    assert not matcher.matches("/docsearch")
+    assert not matcher.matches("/auth/login-as")
+    assert not matcher.matches("/bookings/")
+
+
+def test_path_matcher_with_trailing_slash_entry():
+    matcher = PathMatcher(["/public/"])
+
+    assert matcher.matches("/public/")
+    assert matcher.matches("/public/file")
+    assert not matcher.matches("/publicity")
+
+
+@pytest.fixture
+def app_client():
+    app = FastAPI()
+
+    @app.get("/private")
+    async def private(request: Request):
+        return {"user": request.state.user}
+
+    @app.get("/docs/page")
+    async def public():
+        return {"ok": True}
+
+    app.add_middleware(JWTMiddleware, excluded_paths=["/docs", "/"])
+    app.add_middleware(RequestLoggingMiddleware)
+    return TestClient(app)
+
+
+def bearer(**claims):
+    payload = {"sub": "user@example.com", "exp": int(time.time()) + 60, **claims}
+    return {"Authorization": f"Bearer {jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)}"}
+
+
+def test_excluded_paths_need_no_token(app_client):
+    assert app_client.get("/docs/page").status_code == 200
+
+
+def test_missing_token_is_401(app_client):
+    response = app_client.get("/private")
+
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+    assert response.json() == {"detail": "Missing or invalid authentication token"}
+    assert app_client.get("/private", headers={"Authorization": "Basic abc"}).status_code == 401
+
+
+def test_invalid_token_is_401(app_client):
+    response = app_client.get("/private", headers={"Authorization": "Bearer not-a-jwt"})
+
+    assert response.status_code == 401
+    assert response.json()["detail"].startswith("Invalid token")
+
+
+def test_scoped_token_is_not_a_bearer_token(app_client):
+    assert app_client.get("/private", headers=bearer(scope="seat_stream")).status_code == 401
+
+
+def test_valid_token_reaches_the_route_with_its_payload(app_client):
+    response = app_client.get("/private", headers=bearer())
+
+    assert response.status_code == 200
+    assert response.json() == {"user": "user@example.com"}
+
+
+def test_preflight_is_passed_through(app_client):
+    # No CORS middleware here, so the router answers 405 rather than JWT 401
+    assert app_client.options("/private").status_code == 405
+
+
+def test_request_log_redacts_secrets(app_client, caplog):
+    with caplog.at_level(logging.INFO, logger="core.middleware"):
+        app_client.get("/docs/page?ticket=abc&access_token=def&page=2")
+
+    line = caplog.records[-1].getMessage()
+    assert "abc" not in line and "def" not in line
+    assert "ticket=<redacted>&access_token=<redacted>&page=2" in line
+    assert " 200 " in line
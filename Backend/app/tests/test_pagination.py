@@ -0,0 +1,70 @@
+from datetime import datetime
+
+import pytest
+
+from core.pagination import NEXT_CURSOR_HEADER, InvalidCursor, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("amount", 12.5, 7)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, "amount") == (12.5, 7)
+
+
+def test_cursor_keeps_datetimes_as_iso_strings():
+    cursor = encode_cursor("time", datetime(2024, 5, 1, 12, 30), 3)
+
+    assert decode_cursor(cursor, "time") == ("2024-05-01T12:30:00", 3)
+
+
+def test_cursor_for_another_sort_is_rejected():
+    with pytest.raises(InvalidCursor):
+        decode_cursor(encode_cursor("time", "2024-05-01T12:30:00", 3), "amount")
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", encode_cursor("time", "x", 1)[:-4]])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, "time")
+
+
+def create_bookings(client, headers, count):
+    ticket_type = client.post("/ticket-types/", json={"name": "Standard", "price": 10}, headers=headers).json()
+    client.post("/seats/bulk", json={"ticket_type_id": ticket_type["id"], "quantity": count * 2}, headers=headers)
+    for index in range(count):
+        client.post(
+            "/bookings/initiate",
+            json={"seats_requested": [{"ticket_type_id": ticket_type["id"], "quantity": 1 + index % 2}]},
+            headers=headers
+        )
+
+
+@pytest.mark.parametrize("sort", ["time", "amount"])
+def test_admin_booking_list_pages_through_every_booking_once(client, login, sort):
+    admin = login("admin@example.com", type="admin")
+    create_bookings(client, admin, 5)
+
+    ids, pages, params = [], 0, {"sort": sort, "order": "desc", "limit": 2}
+    while True:
+        response = client.get("/bookings/admin/list", params=params, headers=admin)
+        assert response.status_code == 200
+        ids.extend(booking["id"] for booking in response.json())
+        pages += 1
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+        params["cursor"] = cursor
+
+    assert sorted(ids) == [1, 2, 3, 4, 5]
+    assert pages == 3
+
+
+def test_admin_booking_list_rejects_cursor_of_another_sort(client, login):
+    admin = login("admin@example.com", type="admin")
+    response = client.get(
+        "/bookings/admin/list",
+        params={"sort": "amount", "cursor": encode_cursor("time", "2024-05-01T12:30:00", 3)},
+        headers=admin
+    )
+    assert response.status_code == 400
@@ -0,0 +1,111 @@
+import pytest
+
+from database import AsyncSessionLocal
+from models.user import User
+from services import principal as principal_service
+from services.principal import Principal, principal_cache, profile_cache, resolve_principal
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """Count principal loads from the database"""
+    calls = []
+    load_principal = principal_service.load_principal
+
+    async def counting_load(db, user_id):
+        calls.append(user_id)
+        return await load_principal(db, user_id)
+
+    monkeypatch.setattr(principal_service, "load_principal", counting_load)
+    principal_cache.clear()
+    profile_cache.clear()
+    return calls
+
+
+async def add_user(db, email="user@example.com"):
+    user = User(name="Ann", email=email, hashed_password="x", type="user")
+    db.add(user)
+    await db.commit()
+    return user
+
+
+def test_principal_is_cached_until_the_user_changes(database, loads):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            user = await add_user(db)
+            token_data = {"sub": user.email, "uid": user.id}
+
+            assert await resolve_principal(db, token_data) == Principal(user.id, user.email, "user", "Ann")
+            await resolve_principal(db, token_data)
+            assert len(loads) == 1
+
+            user.name = "Bob"
+            await db.commit()
+            assert (await resolve_principal(db, token_data)).name == "Bob"
+            assert len(loads) == 2
+
+    database(scenario())
+
+
+def test_rolled_back_changes_keep_the_cache(database, loads):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            user = await add_user(db)
+            token_data = {"sub": user.email, "uid": user.id}
+            await resolve_principal(db, token_data)
+
+            user.name = "Bob"
+            await db.flush()
+            await db.rollback()
+            assert (await resolve_principal(db, token_data)).name == "Ann"
+            assert len(loads) == 1
+
+    database(scenario())
+
+
+def test_deleted_user_is_dropped(database, loads):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            user = await add_user(db)
+            token_data = {"sub": user.email, "uid": user.id}
+            await resolve_principal(db, token_data)
+
+            await db.delete(user)
+            await db.commit()
+            assert await resolve_principal(db, token_data) is None
+
+    database(scenario())
+
+
+def test_token_for_another_email_is_rejected(database, loads):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            user = await add_user(db)
+            assert await resolve_principal(db, {"sub": "other@example.com", "uid": user.id}) is None
+
+    database(scenario())
+
+
+def test_tokens_without_uid_are_resolved_by_email_uncached(database, loads):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            user = await add_user(db)
+            assert (await resolve_principal(db, {"sub": user.email})).id == user.id
+            assert not loads
+            assert user.id not in principal_cache._entries
+
+    database(scenario())
+
+
+def test_me_reflects_profile_changes(client, login):
+    headers = login("user@example.com")
+    assert client.get("/auth/me", headers=headers).json()["name"] == "Test User"
+
+    async def change_phone_number():
+        async with AsyncSessionLocal() as db:
+            user = await db.get(User, 1)
+            user.phone_number = "0987654321"
+            await db.commit()
+
+    client.portal.call(change_phone_number)
+    assert client.get("/auth/me", headers=headers).json()["phone_number"] == "0987654321"
@@ -0,0 +1,58 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from core import rate_limit
+from core.rate_limit import LocalBucketStore, TokenBucketLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def take(store, key, capacity=2, refill_per_second=1.0):
+    return asyncio.run(store.take(key, capacity, refill_per_second))
+
+
+def test_bucket_allows_burst_then_reports_wait(clock):
+    store = LocalBucketStore(max_keys=10)
+
+    assert take(store, "ip") == 0
+    assert take(store, "ip") == 0
+    assert take(store, "ip") == pytest.approx(1.0)
+
+
+def test_bucket_refills_over_time(clock):
+    store = LocalBucketStore(max_keys=10)
+    take(store, "ip")
+    take(store, "ip")
+
+    clock[0] += 0.5
+    assert take(store, "ip") == pytest.approx(0.5)
+    clock[0] += 1.0
+    assert take(store, "ip") == 0
+
+
+def test_buckets_are_bounded_lru(clock):
+    store = LocalBucketStore(max_keys=2)
+    take(store, "a")
+    take(store, "b")
+    take(store, "a")
+    take(store, "c")
+
+    assert list(store._buckets) == ["a", "c"]
+
+
+def test_limiter_raises_429_with_retry_after(clock):
+    limiter = TokenBucketLimiter("test_limit", capacity=1, refill_per_second=0.25, store=LocalBucketStore(10))
+    asyncio.run(limiter.check("ip"))
+
+    with pytest.raises(HTTPException) as rejected:
+        asyncio.run(limiter.check("ip"))
+    assert rejected.value.status_code == 429
+    assert rejected.value.headers["Retry-After"] == "4"
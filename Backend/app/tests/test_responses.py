@@ -0,0 +1,19 @@
+from datetime import datetime
+import json
+
+from core.responses import FastJSONResponse, dumps
+
+
+def test_dumps_serializes_datetimes_and_int_keys():
+    body = dumps({"time": datetime(2024, 5, 1, 12, 30), "available": {1: 10}})
+
+    assert isinstance(body, bytes)
+    assert json.loads(body) == {"time": "2024-05-01T12:30:00", "available": {"1": 10}}
+
+
+def test_fast_json_response_renders_content_once():
+    response = FastJSONResponse({"id": 1, "items": [1, 2]}, status_code=201)
+
+    assert response.status_code == 201
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == {"id": 1, "items": [1, 2]}
@@ -0,0 +1,93 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.exc import DBAPIError
+
+import database
+from core.config import settings
+from database import is_retryable_error, run_in_transaction
+
+
+class DriverError(Exception):
+    def __init__(self, sqlstate=None, message="driver error"):
+        super().__init__(message)
+        self.sqlstate = sqlstate
+
+
+def db_error(sqlstate=None, message="driver error"):
+    return DBAPIError("UPDATE seats", {}, DriverError(sqlstate, message))
+
+
+class FakeSession:
+    def __init__(self):
+        self.rollbacks = 0
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture
+def backoff(monkeypatch):
+    """Record the backoff bound of each retry instead of sleeping"""
+    bounds = []
+
+    def uniform(low, high):
+        bounds.append(high)
+        return 0
+
+    monkeypatch.setattr(database, "random", SimpleNamespace(uniform=uniform))
+    monkeypatch.setattr(settings, "DB_RETRY_BASE_DELAY_SECONDS", 0.01)
+    monkeypatch.setattr(settings, "DB_RETRY_MAX_DELAY_SECONDS", 0.05)
+    return bounds
+
+
+def failing_work(failures):
+    attempts = []
+
+    async def work():
+        attempts.append(1)
+        if len(attempts) <= len(failures):
+            raise failures[len(attempts) - 1]
+        return "committed"
+
+    return work, attempts
+
+
+def test_retryable_errors():
+    assert is_retryable_error(db_error("40001"))
+    assert is_retryable_error(db_error("40P01"))
+    assert is_retryable_error(db_error(message="database is locked"))
+    assert not is_retryable_error(db_error("23505"))
+
+
+def test_retries_serialization_failures_with_capped_backoff(backoff):
+    db = FakeSession()
+    work, attempts = failing_work([db_error("40001"), db_error("40P01"), db_error("40001")])
+
+    assert asyncio.run(run_in_transaction(db, work, max_attempts=5)) == "committed"
+    assert len(attempts) == 4
+    assert db.rollbacks == 3
+    assert backoff == pytest.approx([0.02, 0.04, 0.05])
+
+
+def test_gives_up_after_max_attempts(backoff):
+    db = FakeSession()
+    work, attempts = failing_work([db_error("40001")] * 3)
+
+    with pytest.raises(DBAPIError):
+        asyncio.run(run_in_transaction(db, work, max_attempts=3))
+    assert len(attempts) == 3
+    assert db.rollbacks == 3
+
+
+@pytest.mark.parametrize("error", [db_error("23505"), ValueError("boom")])
+def test_other_errors_roll_back_without_retry(backoff, error):
+    db = FakeSession()
+    work, attempts = failing_work([error])
+
+    with pytest.raises(type(error)):
+        asyncio.run(run_in_transaction(db, work))
+    assert len(attempts) == 1
+    assert db.rollbacks == 1
+    assert backoff == []
@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from services.sales_rollup import _accumulate, _rollup_rows, bucket_start, sales_sign
+
+
+def test_bucket_start_truncates_to_the_hour():
+    assert bucket_start(datetime(2024, 5, 1, 12, 34, 56, 789)) == datetime(2024, 5, 1, 12)
+
+
+def test_sales_sign():
+    assert sales_sign("pending", "paid") == 1
+    assert sales_sign("paid", "canceled") == -1
+    assert sales_sign("paid", "paid") == 0
+    assert sales_sign("pending", "canceled") == 0
+
+
+def test_accumulate_adds_and_subtracts_per_bucket_and_ticket_type():
+    totals = {}
+    _accumulate(totals, (datetime(2024, 5, 1, 12, 5), 1, 2, 20.0), 1)
+    _accumulate(totals, (datetime(2024, 5, 1, 12, 55), 1, 1, 10.0), 1)
+    _accumulate(totals, (datetime(2024, 5, 1, 13, 0), 1, 3, None), 1)
+    _accumulate(totals, (datetime(2024, 5, 1, 12, 30), 1, 1, 10.0), -1)
+
+    assert _rollup_rows(totals) == [
+        {"bucket_start": datetime(2024, 5, 1, 12), "ticket_type_id": 1, "tickets_sold": 2, "revenue": 20.0},
+        {"bucket_start": datetime(2024, 5, 1, 13), "ticket_type_id": 1, "tickets_sold": 3, "revenue": 0.0},
+    ]
+
+
+REPORT_RANGE = {"date_from": "2024-01-01T00:00:00", "date_to": "2024-02-01T00:00:00"}
+
+
+def test_sales_report_is_admin_only(client, login):
+    response = client.get("/reports/sales", params=REPORT_RANGE, headers=login("user@example.com"))
+    assert response.status_code == 403
+
+
+def test_sales_report_for_admin(client, login):
+    response = client.get("/reports/sales", params=REPORT_RANGE, headers=login("admin@example.com", type="admin"))
+    assert response.status_code == 200
+    assert response.json()["tickets_sold"] == 0
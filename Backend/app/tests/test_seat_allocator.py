@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from database import AsyncSessionLocal
+from models.seat import Seat
+from models.ticket_type import TicketType
+from services import booking as booking_service
+from services.seat_allocator import SeatAllocator
+
+
+def allocator_with(ticket_type_id, seat_ids):
+    allocator = SeatAllocator(rebuild_interval_seconds=60)
+    allocator.release(ticket_type_id, seat_ids)
+    return allocator
+
+
+def test_allocate_hands_out_free_seats_in_order():
+    allocator = allocator_with(1, [1, 2, 3])
+
+    assert allocator.allocate(1, 2) == [1, 2]
+    assert allocator.allocate(1, 5) == [3]
+    assert allocator.allocate(2, 1) == []
+    assert allocator.available(1) == 0
+    assert allocator._in_flight == {1, 2, 3}
+
+
+def test_settle_forgets_committed_seats():
+    allocator = allocator_with(1, [1, 2])
+    allocator.settle(allocator.allocate(1, 2))
+
+    assert not allocator._in_flight
+    assert allocator.available(1) == 0
+
+
+def test_release_returns_seats_once():
+    allocator = allocator_with(1, [1, 2])
+    seat_ids = allocator.allocate(1, 2)
+    allocator.release(1, seat_ids)
+    allocator.release(1, seat_ids)
+
+    assert allocator.available(1) == 2
+    assert allocator.allocate(1, 5) == [1, 2]
+
+
+def test_discard_skips_seats_taken_elsewhere():
+    allocator = allocator_with(1, [1, 2, 3])
+    allocator.discard([1, 3])
+
+    assert allocator.available(1) == 1
+    assert allocator.allocate(1, 3) == [2]
+
+
+async def add_seats(count, taken=0):
+    async with AsyncSessionLocal() as db:
+        ticket_type = TicketType(name="Standard", price=10)
+        db.add(ticket_type)
+        await db.flush()
+        db.add_all(
+            Seat(ticket_type_id=ticket_type.id, is_available=index >= taken)
+            for index in range(count)
+        )
+        await db.commit()
+        return ticket_type.id
+
+
+def test_load_skips_taken_and_in_flight_seats(database):
+    async def scenario():
+        ticket_type_id = await add_seats(4, taken=1)
+        allocator = SeatAllocator(rebuild_interval_seconds=60)
+        allocator._in_flight.add(2)
+        async with AsyncSessionLocal() as db:
+            await allocator.load(db)
+        return ticket_type_id, allocator
+
+    ticket_type_id, allocator = database(scenario())
+    assert allocator.allocate(ticket_type_id, 5) == [3, 4]
+
+
+def test_rebuild_runs_once_per_ticket_type_and_is_rate_limited(database):
+    async def scenario():
+        ticket_type_id = await add_seats(3)
+        allocator = SeatAllocator(rebuild_interval_seconds=60)
+
+        allocator.mark_stale(ticket_type_id)
+        rebuild = allocator._rebuilds[ticket_type_id]
+        allocator.mark_stale(ticket_type_id)
+        assert allocator._rebuilds[ticket_type_id] is rebuild
+        await rebuild
+        assert allocator.available(ticket_type_id) == 3
+
+        # The next rebuild waits out the interval instead of scanning again
+        allocator.mark_stale(ticket_type_id)
+        await asyncio.sleep(0.01)
+        assert not allocator._rebuilds[ticket_type_id].done()
+        allocator._rebuilds[ticket_type_id].cancel()
+
+    database(scenario())
+
+
+def test_failed_claim_returns_seats_to_the_allocator(monkeypatch):
+    allocator = allocator_with(1, [1, 2])
+    monkeypatch.setattr(booking_service, "seat_allocator", allocator)
+
+    async def serialization_failure(db, seat_ids):
+        raise OperationalError("UPDATE seats", {}, Exception("could not serialize access"))
+
+    monkeypatch.setattr(booking_service, "claim_seat_ids", serialization_failure)
+
+    with pytest.raises(OperationalError):
+        asyncio.run(booking_service.allocate_seats(None, 1, 2))
+    assert not allocator._in_flight
+    assert allocator.allocate(1, 2) == [1, 2]
+
+
+def test_failed_fallback_returns_claimed_seats(monkeypatch):
+    allocator = allocator_with(1, [1, 2])
+    allocator.discard([2])
+    monkeypatch.setattr(booking_service, "seat_allocator", allocator)
+
+    async def claim_seat_ids(db, seat_ids):
+        return list(seat_ids)
+
+    async def claim_seats(db, ticket_type_id, quantity):
+        raise OperationalError("UPDATE seats", {}, Exception("deadlock detected"))
+
+    monkeypatch.setattr(booking_service, "claim_seat_ids", claim_seat_ids)
+    monkeypatch.setattr(booking_service, "claim_seats", claim_seats)
+
+    with pytest.raises(OperationalError):
+        asyncio.run(booking_service.allocate_seats(None, 1, 2))
+    assert not allocator._in_flight
+    assert allocator.allocate(1, 2) == [1]
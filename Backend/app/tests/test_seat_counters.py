@@ -0,0 +1,25 @@
+def seat_count(client, headers):
+    body = client.get("/seats/count", headers=headers).json()
+    return body["available_seats"], body["total_seats"]
+
+
+def test_cancel_does_not_recredit_a_seat_freed_by_an_admin(client, login):
+    admin = login("admin@example.com", type="admin")
+    ticket_type = client.post("/ticket-types/", json={"name": "Standard", "price": 10}, headers=admin).json()
+    client.post("/seats/bulk", json={"ticket_type_id": ticket_type["id"], "quantity": 3}, headers=admin)
+    booking = client.post(
+        "/bookings/initiate",
+        json={"seats_requested": [{"ticket_type_id": ticket_type["id"], "quantity": 1}]},
+        headers=admin
+    ).json()
+    assert seat_count(client, admin) == (2, 3)
+
+    held_seat = next(
+        seat for seat in client.get("/seats/", headers=admin).json() if not seat["is_available"]
+    )
+    client.put(f"/seats/{held_seat['id']}", json={"is_available": True}, headers=admin)
+    assert seat_count(client, admin) == (3, 3)
+
+    response = client.post(f"/bookings/{booking['id']}/cancel", headers=admin)
+    assert response.status_code == 200
+    assert seat_count(client, admin) == (3, 3)
@@ -0,0 +1,106 @@
+from types import SimpleNamespace
+import time
+
+import pytest
+from jose import JWTError, jwt
+
+from core import security
+from core.config import settings
+from core.security import (
+    STREAM_TICKET_SCOPE,
+    UsedTicketRegistry,
+    VerifiedTokenCache,
+    create_stream_ticket,
+    decode_token,
+    redeem_stream_ticket
+)
+
+
+def access_token(expires_in=3600, **claims):
+    payload = {"sub": "user@example.com", "uid": 1, "type": "user", "exp": int(time.time()) + expires_in, **claims}
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(security, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+def test_cache_drops_entries_once_the_token_expires(clock):
+    cache = VerifiedTokenCache(max_entries=10)
+    cache.put("token", {"sub": "a", "exp": 1010})
+
+    assert cache.get("token") == {"sub": "a", "exp": 1010}
+    clock[0] = 1010
+    assert cache.get("token") is None
+    assert not cache._entries
+
+
+def test_cache_skips_tokens_without_exp_and_is_bounded():
+    cache = VerifiedTokenCache(max_entries=2)
+    cache.put("no-exp", {"sub": "a"})
+    assert cache.get("no-exp") is None
+
+    expires_at = time.time() + 60
+    for token in ("a", "b", "c"):
+        cache.put(token, {"exp": expires_at})
+    assert cache.get("a") is None
+    assert cache.get("c") is not None
+
+
+def test_decode_token_verifies_each_token_once(monkeypatch):
+    security.verified_token_cache.clear()
+    calls = []
+    real_decode = jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(1)
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(security.jwt, "decode", counting_decode)
+    token = access_token()
+
+    assert decode_token(token)["sub"] == "user@example.com"
+    assert decode_token(token)["sub"] == "user@example.com"
+    assert len(calls) == 1
+
+
+def test_decode_token_rejects_expired_and_forged_tokens():
+    with pytest.raises(JWTError):
+        decode_token(access_token(expires_in=-10))
+    forged = jwt.encode({"sub": "admin@example.com", "exp": int(time.time()) + 60}, "not-the-key", algorithm="HS256")
+    with pytest.raises(JWTError):
+        decode_token(forged)
+
+
+def test_stream_ticket_is_single_use_and_carries_only_the_user_id():
+    ticket = create_stream_ticket({"sub": "user@example.com", "uid": 1, "type": "user"})
+
+    payload = redeem_stream_ticket(ticket)
+    assert payload["uid"] == 1
+    assert payload["scope"] == STREAM_TICKET_SCOPE
+    assert "sub" not in payload
+    with pytest.raises(JWTError):
+        redeem_stream_ticket(ticket)
+
+
+def test_stream_tickets_and_access_tokens_are_not_interchangeable():
+    ticket = create_stream_ticket({"sub": "user@example.com", "uid": 1, "type": "user"})
+    with pytest.raises(JWTError):
+        decode_token(ticket)
+    with pytest.raises(JWTError):
+        redeem_stream_ticket(access_token())
+    with pytest.raises(JWTError):
+        decode_token(access_token(scope="admin"))
+
+
+def test_used_ticket_registry_forgets_expired_tickets(clock):
+    registry = UsedTicketRegistry()
+
+    assert registry.claim("a", expires_at=1010)
+    assert not registry.claim("a", expires_at=1010)
+    clock[0] = 1011
+    assert registry.claim("b", expires_at=1041)
+    assert list(registry._used) == ["b"]
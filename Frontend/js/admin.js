@@ -376,6 +376,12 @@ document.addEventListener('DOMContentLoaded', () => {
     loadTicketTypes();
     loadBookings();
 
+    // Re-query the bookings from the first page when the filters change
+    document.getElementById('bookingFilters').addEventListener('submit', (event) => {
+        event.preventDefault();
+        loadBookings();
+    });
+
     // Add event listener for ticket type modal
     const ticketTypeModal = document.getElementById('ticketTypeModal');
     ticketTypeModal.addEventListener('show.bs.modal', function (event) {
@@ -389,8 +395,34 @@ document.addEventListener('DOMContentLoaded', () => {
     });
 });
 
-// Load bookings
-async function loadBookings() {
+// Cursor of the next bookings page (X-Next-Cursor), null on the last page
+let bookingsNextCursor = null;
+
+// Add one day to a yyyy-mm-dd date; created_to is exclusive
+function nextDay(dateValue) {
+    const date = new Date(`${dateValue}T00:00:00`);
+    date.setDate(date.getDate() + 1);
+    const pad = (value) => String(value).padStart(2, '0');
+    return `${date.getFullYear()}-${pad(date.getMonth() + 1)}-${pad(date.getDate())}T00:00:00`;
+}
+
+// Query string for the sort / filter controls
+function bookingListParams() {
+    const params = new URLSearchParams({
+        sort: document.getElementById('bookingSort').value,
+        order: document.getElementById('bookingOrder').value
+    });
+    const statusFilter = document.getElementById('bookingStatusFilter').value;
+    const createdFrom = document.getElementById('bookingCreatedFrom').value;
+    const createdTo = document.getElementById('bookingCreatedTo').value;
+    if (statusFilter) params.set('status', statusFilter);
+    if (createdFrom) params.set('created_from', `${createdFrom}T00:00:00`);
+    if (createdTo) params.set('created_to', nextDay(createdTo));
+    return params;
+}
+
+// Load bookings; append=true fetches the next page into the table
+async function loadBookings(append = false) {
     try {
         console.log('Starting loadBookings...');
         if (!await checkAuth()) {
@@ -399,7 +431,12 @@ async function loadBookings() {
         }
         console.log('Auth check passed');
 
-        const url = `${BOOKINGS_URL}/admin/list`;
+        const params = bookingListParams();
+        if (append) {
+            if (!bookingsNextCursor) return;
+            params.set('cursor', bookingsNextCursor);
+        }
+        const url = `${BOOKINGS_URL}/admin/list?${params.toString()}`;
         console.log('API URL:', url);
 
         // Use defaultFetchOptions like other API calls
@@ -438,7 +475,16 @@ async function loadBookings() {
             console.error('Element with id bookingsTableBody not found');
             return;
         }
-        tableBody.innerHTML = '';
+        if (!append) {
+            tableBody.innerHTML = '';
+        }
+
+        // More pages follow while the API returns a cursor
+        bookingsNextCursor = response.headers.get('X-Next-Cursor');
+        const loadMoreButton = document.getElementById('loadMoreBookings');
+        if (loadMoreButton) {
+            loadMoreButton.classList.toggle('d-none', !bookingsNextCursor);
+        }
 
         bookings.forEach(booking => {
             console.log('Booking:', booking);
@@ -615,4 +661,35 @@ document.addEventListener('DOMContentLoaded', function() {
     console.log('Loading initial data...');
     loadBookings();
     loadTicketTypes();
+    subscribeAvailability();
 });
+
+// Tải lại bảng loại vé khi số ghế thay đổi (server gộp các thay đổi theo từng khoảng thời gian ngắn)
+function subscribeAvailability() {
+    let source = null;
+    // Ticket dùng một lần: mỗi lần kết nối (lại) phải xin ticket mới, vì
+    // EventSource tự kết nối lại bằng URL cũ sẽ bị từ chối
+    const connect = async () => {
+        try {
+            const response = await fetch(`${API_BASE_URL}/auth/stream-ticket`, {
+                method: 'POST',
+                headers: { 'Authorization': `Bearer ${localStorage.getItem('access_token')}` }
+            });
+            if (response.status === 401) return;
+            if (!response.ok) throw new Error(`Stream ticket request failed: ${response.status}`);
+            const { ticket } = await response.json();
+            source = new EventSource(`${SEATS_URL}/stream?ticket=${encodeURIComponent(ticket)}`);
+        } catch (error) {
+            console.error('Could not open availability stream:', error);
+            setTimeout(connect, 5000);
+            return;
+        }
+        source.addEventListener('availability', () => loadTicketTypes());
+        source.onerror = () => {
+            source.close();
+            setTimeout(connect, 3000);
+        };
+    };
+    connect();
+    window.addEventListener('beforeunload', () => source && source.close());
+}
@@ -45,8 +45,61 @@ let currentBooking = null;
 document.addEventListener('DOMContentLoaded', async () => {
     await checkAuth();
     await loadTicketTypes();
+    subscribeAvailability();
 });
 
+// Nhận cập nhật số ghế còn trống qua Server-Sent Events thay vì polling
+function subscribeAvailability() {
+    const applyAvailability = (event) => {
+        const data = JSON.parse(event.data);
+        Object.entries(data.available).forEach(([ticketTypeId, available]) => {
+            updateAvailableQuantity(ticketTypeId, available);
+        });
+        if (data.removed && data.removed.length > 0) {
+            loadTicketTypes();
+        }
+    };
+    let source = null;
+    // Ticket dùng một lần: mỗi lần kết nối (lại) phải xin ticket mới, vì
+    // EventSource tự kết nối lại bằng URL cũ sẽ bị từ chối
+    const connect = async () => {
+        try {
+            const response = await fetch(`${API_BASE_URL}/auth/stream-ticket`, {
+                method: 'POST',
+                headers: { 'Authorization': `Bearer ${localStorage.getItem('access_token')}` }
+            });
+            if (response.status === 401) return;
+            if (!response.ok) throw new Error(`Stream ticket request failed: ${response.status}`);
+            const { ticket } = await response.json();
+            source = new EventSource(`${SEATS_URL}/stream?ticket=${encodeURIComponent(ticket)}`);
+        } catch (error) {
+            console.error('Could not open availability stream:', error);
+            setTimeout(connect, 5000);
+            return;
+        }
+        source.addEventListener('snapshot', applyAvailability);
+        source.addEventListener('availability', applyAvailability);
+        source.onerror = () => {
+            source.close();
+            setTimeout(connect, 3000);
+        };
+    };
+    connect();
+    window.addEventListener('beforeunload', () => source && source.close());
+}
+
+function updateAvailableQuantity(ticketTypeId, available) {
+    const label = document.getElementById(`available-${ticketTypeId}`);
+    const input = document.getElementById(`quantity-${ticketTypeId}`);
+    if (!label || !input) return;
+    label.textContent = `Available: ${available}`;
+    input.max = available;
+    // Giảm số lượng đã chọn nếu vượt quá số ghế còn lại
+    if ((parseInt(input.value) || 0) > available) {
+        updateQuantity(parseInt(ticketTypeId), 0);
+    }
+}
+
 // Add event listener for page visibility change
 document.addEventListener('visibilitychange', async () => {
     if (document.visibilityState === 'visible') {
@@ -108,7 +161,7 @@ function createTicketCard(ticketType) {
             <div class="card-body">
                 <h5 class="card-title">${ticketType.name}</h5>
                 <p class="card-text">Price: $${ticketType.price.toFixed(2)}</p>
-                <p class="card-text text-muted">Available: ${availableQuantity}</p>
+                <p class="card-text text-muted" id="available-${ticketType.id}">Available: ${availableQuantity}</p>
                 <div class="d-flex align-items-center">
                     <div class="input-group quantity-control">
                         <button class="btn btn-outline-secondary" type="button" onclick="updateQuantity(${ticketType.id}, -1)">-</button>